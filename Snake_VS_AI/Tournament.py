@@ -1,33 +1,50 @@
-import pygame
+import io
 import random
+import time
+from multiprocessing import Pool
 from game.constants import *
-from game.snake import Snake
+from game.config import BoardConfig, DEFAULT_BOARD
+from game.engine import GameEngine
 from game.ai import SnakeAI
+from game.metrics import DecisionTimer, SequentialTest, EVEN
+from game.replay import ReplayRecorder
+from game.results import ResultsLog, completed_games
 
 from game.AI_Compeditors.CycleSafeAStarAI import CycleSafeAStarAI
 from game.AI_Compeditors.PathfindingStrategicAI import PathfindingStrategicAI
 from game.AI_Compeditors.SmartSurvivorAI import SmartSurvivorAI
 from game.AI_Compeditors.UltimateHybridAI import UltimateHybridAI
+from game.AI_Compeditors.HamiltonianAI import HamiltonianAI
 
 
+# pygame is only imported for visual runs, so headless jobs never load it
+
 # Alternate AI for comparison (optional)
 class AlternateAI(SnakeAI):
     def get_next_move(self, apple_pos):
         return self.get_basic_direction(apple_pos)
 
-def spawn_apple(snake1, snake2):
-    while True:
-        pos = (random.randint(2, GRID_WIDTH - 3), random.randint(2, GRID_HEIGHT - 3))
-        if pos not in snake1.body and pos not in snake2.body:
-            return pos
-
-def simulate_game(screen, clock, AI1_class, AI2_class, max_apples=10, fps=30, headless=False):
-    snake1 = Snake(GRID_WIDTH // 4, GRID_HEIGHT // 2, (0, 255, 0))
-    snake2 = Snake(3 * GRID_WIDTH // 4, GRID_HEIGHT // 2, (0, 0, 255))
+def simulate_game(screen, clock, AI1_class, AI2_class, max_apples=10, fps=30, headless=False, timer=None,
+                  budget_ms=None, budget_nodes=None, board=DEFAULT_BOARD, seed=None, recorder=None,
+                  max_ticks=None, starvation_ticks=None):
+    # The game is a draw after max_ticks ticks, or once starvation_ticks go
+    # by without either snake eating. starvation_ticks=None means one tick
+    # per cell of the board, enough to reach any apple on a free path; 0
+    # turns either limit off.
+    if starvation_ticks is None:
+        starvation_ticks = board.width * board.height
+    engine = GameEngine(target_apples=max_apples, colors=((0, 255, 0), (0, 0, 255)), board=board,
+                        seed=seed, recorder=recorder)
+    snake1, snake2 = engine.snakes
     ai1 = AI1_class(snake1, snake2, difficulty='hard')
     ai2 = AI2_class(snake2, snake1, difficulty='hard')
+    for ai, stream in ((ai1, 'ai1'), (ai2, 'ai2')):
+        ai.rng = engine.rng_for(stream)
+        ai.distance_field = engine.distance_field
+        ai.space_analysis = engine.space_analysis
+        ai.set_budget(budget_ms, budget_nodes)
 
-    apple = spawn_apple(snake1, snake2)
+    apple = engine.apple
 
     # Fix: Set initial direction toward apple to avoid blocked reversal
     dx1 = apple[0] - snake1.body[0][0]
@@ -44,90 +61,200 @@ def simulate_game(screen, clock, AI1_class, AI2_class, max_apples=10, fps=30, he
     elif dy2 != 0:
         snake2.direction = (0, 1 if dy2 > 0 else -1)
 
+    if not headless:
+        from game.renderer import BoardRenderer
+        board_renderer = BoardRenderer(screen, (0, 0, 0), (139, 69, 19))
+
+    last_meal = 0
+    eaten = 0
     while True:
         if not headless:
+            import pygame
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
 
-        dir1 = ai1.get_next_move(apple)
-        snake1.change_direction(dir1)
-        snake1.move()
-
-        dir2 = ai2.get_next_move(apple)
-        snake2.change_direction(dir2)
-        snake2.move()
-
-        if snake1.body[0] == apple:
-            snake1.grow()
-            apple = spawn_apple(snake1, snake2)
-        elif snake2.body[0] == apple:
-            snake2.grow()
-            apple = spawn_apple(snake1, snake2)
-
-        if snake1.check_collision(snake2):
-            return "AI2"
-        elif snake2.check_collision(snake1):
-            return "AI1"
-        elif snake1.score >= max_apples:
-            return "AI1"
-        elif snake2.score >= max_apples:
-            return "AI2"
+        if timer is None:
+            engine.move(0, ai1.choose_move(engine.apple))
+            engine.move(1, ai2.choose_move(engine.apple))
+        else:
+            engine.move(0, timer.decide(ai1, 0, engine.tick, engine.apple))
+            engine.move(1, timer.decide(ai2, 1, engine.tick, engine.apple))
+
+        if engine.update():
+            return engine
+        if snake1.score + snake2.score != eaten:
+            eaten = snake1.score + snake2.score
+            last_meal = engine.tick
+        if ((max_ticks and engine.tick >= max_ticks) or
+                (starvation_ticks and engine.tick - last_meal >= starvation_ticks)):
+            engine.declare_draw()
+            return engine
 
         if not headless:
-            screen.fill((0, 0, 0))
-            draw_walls(screen)
-            snake1.draw(screen)
-            snake2.draw(screen)
+            board_renderer.draw(engine, engine.snakes)
+            clock.tick(fps)
 
-            pygame.draw.rect(screen, RED,
-                             (apple[0]*GRID_SIZE, apple[1]*GRID_SIZE, GRID_SIZE-2, GRID_SIZE-2))
+def play_seeded_game(job, screen=None, clock=None):
+    # Also runs in worker processes, so results (the game's results record,
+    # decision timings, the recorded replay bytes) are returned rather than
+    # written anywhere
+    seed, AI1_class, AI2_class, options = job
+    timer = DecisionTimer() if options['instrument'] else None
+    replay = io.BytesIO() if options['record'] else None
+    board = options['board']
+    start = time.perf_counter()
+    engine = simulate_game(screen, clock, AI1_class, AI2_class, headless=screen is None, timer=timer,
+                           budget_ms=options['budget_ms'], budget_nodes=options['budget_nodes'],
+                           board=board, seed=seed,
+                           recorder=ReplayRecorder(replay) if replay else None,
+                           max_ticks=options['max_ticks'], starvation_ticks=options['starvation_ticks'])
+    winner = "Draw" if engine.winner is None else ("AI1", "AI2")[engine.winner]
+    result = {'seed': seed, 'ai1': AI1_class.__name__, 'ai2': AI2_class.__name__,
+              'board': f"{board.width}x{board.height}", 'winner': winner,
+              'ticks': engine.tick, 'scores': [snake.score for snake in engine.snakes],
+              'seconds': round(time.perf_counter() - start, 4)}
+    return result, timer.records if timer else None, replay.getvalue() if replay else None
 
-            pygame.display.flip()
-            clock.tick(fps)
+def run_tournament(rounds=100, headless=False, workers=1, seed=None, instrument=False,
+                   budget_ms=None, budget_nodes=None, board=DEFAULT_BOARD, record=None,
+                   confidence=None, margin=0.1, results=None, max_ticks=None, starvation_ticks=None):
+    # workers > 1 plays the rounds in parallel processes (always headless)
+    # instrument=True times every AI decision and prints p50/p99/max reports
+    # budget_ms / budget_nodes hold both AIs to the same per-move budget; a
+    # node budget keeps seeded games reproducible, a time budget does not
+    # board=BoardConfig(w, h) plays on another board size (always headless)
+    # record=path archives every game as a replay (see game/replay.py)
+    # confidence=0.95 stops as soon as an SPRT decides which AI wins more
+    # often by at least margin, or that neither does (rounds is then the
+    # most games played)
+    # results=path appends a record per game (see game/results.py); run
+    # again with the same seed and path to resume where it stopped (a
+    # record archive is then appended to rather than overwritten)
+    # max_ticks / starvation_ticks end stalled games as draws (see simulate_game)
+    if workers > 1 or not board.is_default():
+        headless = True
+    if seed is None:
+        seed = random.randrange(2**32)
+    print(f"Tournament seed: {seed}, board {board.width}x{board.height}")
 
+    # Headless runs never start pygame, so worker processes fork from a clean state
+    screen = clock = font = None
+    if not headless:
+        import pygame
+        pygame.init()
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Snake AI Tournament")
+        clock = pygame.time.Clock()
+        font = pygame.font.Font(None, 36)
 
+    wins = {"AI1": 0, "AI2": 0, "Draw": 0}
+    test = SequentialTest(confidence, margin) if confidence else None
 
-def draw_walls(screen):
-    wall_color = (139, 69, 19)
-    thickness = GRID_SIZE * 2
-    pygame.draw.rect(screen, wall_color, (0, 0, WINDOW_WIDTH, thickness))
-    pygame.draw.rect(screen, wall_color, (0, WINDOW_HEIGHT - thickness, WINDOW_WIDTH, thickness))
-    pygame.draw.rect(screen, wall_color, (0, 0, thickness, WINDOW_HEIGHT))
-    pygame.draw.rect(screen, wall_color, (WINDOW_WIDTH - thickness, 0, thickness, WINDOW_HEIGHT))
+    #PUT HERE THE SNAKE YOUR SNAKE COMPETES WITH
+    #AI1 ->>>>>>>>>>>>> AI2
+    AI1_class, AI2_class = SnakeAI, PathfindingStrategicAI
 
-def run_tournament(rounds=100, headless=False):
-    pygame.init()
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT)) if not headless else None
-    pygame.display.set_caption("Snake AI Tournament")
-    clock = pygame.time.Clock()
+    # Round i always gets seed + i, so any single game can be reproduced
+    options = {'instrument': instrument, 'budget_ms': budget_ms, 'budget_nodes': budget_nodes,
+               'board': board, 'record': record is not None,
+               'max_ticks': max_ticks, 'starvation_ticks': starvation_ticks}
+    tournament_timer = DecisionTimer() if instrument else None
+    results_log = ResultsLog(results) if results else None
 
-    wins = {"AI1": 0, "AI2": 0}
-    font = pygame.font.Font(None, 36) if not headless else None
+    def count(winner):
+        wins[winner] += 1
+        # True once the match-up is decided and the tournament can stop
+        if test is not None:
+            test.add({"AI1": 0, "AI2": 1}.get(winner))
+            return test.decision() is not None
+        return False
 
-    for i in range(rounds):
-        if not headless:
-            screen.fill((0, 0, 0))
-            title = font.render(f"Round {i+1} / {rounds}", True, (255, 255, 255))
-            screen.blit(title, (10, 10))
-            pygame.display.flip()
-            pygame.time.delay(300)
+    # Rounds already in the results file are counted, not played again
+    done = completed_games(results, AI1_class.__name__, AI2_class.__name__, board) if results else {}
+    pending = [i for i in range(rounds) if seed + i not in done]
+    if done:
+        decided = False
+        for i in range(rounds):
+            if seed + i in done:
+                decided = count(done[seed + i]['winner'])
+        print(f"Resuming: {rounds - len(pending)} rounds already played")
+        if decided:
+            pending = []
+    jobs = [(seed + i, AI1_class, AI2_class, options) for i in pending]
+    # A resumed run adds its games to the archive of the run it continues
+    archive = ReplayRecorder.create(record, append=bool(done)) if record else None
 
-        #PUT HERE THE SNAKE YOUR SNAKE COMPETES WITH
-        #AI1 ->>>>>>>>>>>>> AI2
+    def record_round(i, result, records, replay):
+        if archive:
+            archive.write_game(replay)
+        if results_log:
+            results_log.write(result)
+        winner = result['winner']
+        print(f"Round {i+1}: {winner}" if winner == "Draw" else f"Round {i+1}: {winner} wins")
+        if records is not None:
+            game_timer = DecisionTimer()
+            game_timer.merge(records)
+            print("   ", game_timer.report(0, AI1_class.__name__))
+            print("   ", game_timer.report(1, AI2_class.__name__))
+            print("   ", game_timer.shared_report())
+            tournament_timer.merge(records)
+        return count(winner)
 
-        winner = simulate_game(screen, clock, SnakeAI, PathfindingStrategicAI, headless=headless)
-        wins[winner] += 1
-        print(f"Round {i+1}: {winner} wins")
+    if workers > 1:
+        with Pool(workers) as pool:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            for i, result in zip(pending, pool.imap(play_seeded_game, jobs, chunksize)):
+                if record_round(i, *result):
+                    break  # Leaving the pool terminates the games still running
+    else:
+        for i, job in zip(pending, jobs):
+            if not headless:
+                screen.fill((0, 0, 0))
+                title = font.render(f"Round {i+1} / {rounds}", True, (255, 255, 255))
+                screen.blit(title, (10, 10))
+                pygame.display.flip()
+                pygame.time.delay(300)
 
-        if not headless:
-            pygame.time.delay(500)
+            decided = record_round(i, *play_seeded_game(job, screen, clock))
+
+            if not headless:
+                pygame.time.delay(500)
+            if decided:
+                break
 
-    pygame.quit()
+    if not headless:
+        pygame.quit()
+    if archive:
+        archive.close()
+        print(f"Replays saved to {record}")
+    if results_log:
+        results_log.close()
     print("\n--- Tournament Results ---")
     print("SnakeAI Wins:", wins["AI1"])
     print("Compeditor Wins:", wins["AI2"])
+    print("Draws:", wins["Draw"])
+    if test is not None:
+        low, high = test.interval()
+        decision = test.decision()
+        if decision is None:
+            verdict = "undecided"
+        elif decision == EVEN:
+            verdict = f"evenly matched (neither wins {0.5 + margin:.0%} of games)"
+        elif low <= 0.5 <= high:
+            # The SPRT and the interval can disagree near the bounds
+            verdict = f"{('SnakeAI', 'Compeditor')[decision]} leads, but not clearly"
+        else:
+            verdict = f"{('SnakeAI', 'Compeditor')[decision]} is stronger"
+        print(f"After {test.games} games: {verdict}; SnakeAI win rate "
+              f"{confidence:.0%} interval {low:.2f}-{high:.2f}")
+    if tournament_timer:
+        print("\n--- Decision Latency ---")
+        print(tournament_timer.report(0, AI1_class.__name__))
+        print(tournament_timer.report(1, AI2_class.__name__))
+        print(tournament_timer.shared_report())
 
 if __name__ == "__main__":
-    run_tournament(rounds=100, headless=True)  # Change headless=False to see visuals
+    run_tournament(rounds=100, headless=True)  # Change headless=False to see visuals, workers=N to run in parallel
+    # board=BoardConfig(100, 100) plays the same match-up on a bigger board
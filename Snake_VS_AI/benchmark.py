@@ -0,0 +1,205 @@
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from game.constants import *
+from game.config import BoardConfig
+from game.snake import Snake
+from game.ai import SnakeAI
+from game.metrics import summarize
+from game.pathfinding import DistanceField, SpaceAnalysis
+
+from game.AI_Compeditors.CycleSafeAStarAI import CycleSafeAStarAI
+from game.AI_Compeditors.PathfindingStrategicAI import PathfindingStrategicAI
+from game.AI_Compeditors.SmartSurvivorAI import SmartSurvivorAI
+from game.AI_Compeditors.UltimateHybridAI import UltimateHybridAI
+from game.AI_Compeditors.HamiltonianAI import HamiltonianAI
+
+# Times a single get_next_move call for every AI on a fixed set of seeded
+# board positions, and saves the results as JSON so later runs can be
+# compared against them:
+#
+#   python benchmark.py --output before.json
+#   python benchmark.py --compare before.json
+
+AIS = [
+    ('SnakeAI-easy', SnakeAI, 'easy'),
+    ('SnakeAI-medium', SnakeAI, 'medium'),
+    ('SnakeAI-hard', SnakeAI, 'hard'),
+    ('CycleSafeAStarAI', CycleSafeAStarAI, 'hard'),
+    ('PathfindingStrategicAI', PathfindingStrategicAI, 'hard'),
+    ('SmartSurvivorAI', SmartSurvivorAI, 'hard'),
+    ('UltimateHybridAI', UltimateHybridAI, 'hard'),
+    ('HamiltonianAI', HamiltonianAI, 'hard'),
+]
+
+# The game's own board and a bigger one; add e.g. --boards 40x30 100x100 400x400
+# to see where each AI's per-move cost stops being usable (400x400 takes minutes)
+BOARD_SIZES = [(GRID_WIDTH, GRID_HEIGHT), (100, 100)]
+SNAKE_LENGTHS = [4, 40, 160]
+# Share of the board covered by the opponent's body
+CONGESTION_LEVELS = {'low': 0.05, 'medium': 0.2, 'high': 0.4}
+
+
+def grow_snake(snake, length, others, width, height, rng):
+    # Self-avoiding walk that hugs walls and bodies (fewest free neighbours
+    # first, as in Warnsdorff's rule) so long bodies pack in without
+    # walling themselves off
+    while len(snake.body) < length:
+        head = snake.body[0]
+        options = []
+        for direction in [UP, DOWN, LEFT, RIGHT]:
+            pos = (head[0] + direction[0], head[1] + direction[1])
+            if is_free(pos, [snake] + others, width, height):
+                room = sum(is_free((pos[0] + dx, pos[1] + dy), [snake] + others, width, height)
+                           for dx, dy in [UP, DOWN, LEFT, RIGHT])
+                options.append((room == 0, room, rng.random(), direction))
+        if not options:
+            return False
+        snake.direction = min(options)[3]
+        snake.grow()
+        snake.move()
+    snake.score = 0
+    return True
+
+def is_free(pos, snakes, width, height):
+    return (0 <= pos[0] < width and 0 <= pos[1] < height and
+            not any(snake.occupies(pos) for snake in snakes))
+
+def random_free_cell(snakes, width, height, rng):
+    while True:
+        pos = (rng.randrange(width), rng.randrange(height))
+        if is_free(pos, snakes, width, height):
+            return pos
+
+def build_position(seed, width, height, length, opponent_length):
+    """Reproducible (snake, opponent, apple) for the given sizes."""
+    board = BoardConfig(width, height)
+    for attempt in range(100):
+        rng = random.Random(seed * 1000 + attempt)
+        opponent = Snake(*random_free_cell([], width, height, rng), BLUE, board)
+        if not grow_snake(opponent, opponent_length, [], width, height, rng):
+            continue
+        snake = Snake(*random_free_cell([opponent], width, height, rng), GREEN, board)
+        if not grow_snake(snake, length, [opponent], width, height, rng):
+            continue
+        apple = random_free_cell([snake, opponent], width, height, rng)
+        return snake, opponent, apple
+    raise ValueError(f"could not fit snakes of length {length} and {opponent_length}")
+
+def make_ai(ai_class, difficulty, snake, opponent):
+    ai = ai_class(snake, opponent, difficulty=difficulty)
+    board = snake.board
+    ai.distance_field = DistanceField([snake, opponent], board.width, board.height)
+    ai.space_analysis = SpaceAnalysis([snake, opponent], board.width, board.height)
+    if hasattr(ai, 'first_move_done'):
+        ai.first_move_done = True  # Skip CycleSafeAStarAI's canned opening
+    return ai
+
+def start_tick(ai):
+    # Each timed call should pay for its shared per-tick caches, as in a game
+    ai.distance_field.key = None
+    ai.space_analysis.key = None
+    ai.cache_key = None
+    ai.bitboard.free_key = None
+
+def time_decisions(ai, apple, repeats, seed):
+    samples = []
+    for rep in range(repeats):
+        random.seed(seed + rep)
+        start_tick(ai)
+        start = time.perf_counter_ns()
+        ai.get_next_move(apple)
+        samples.append((time.perf_counter_ns() - start) / 1000)  # microseconds
+    return samples
+
+def measure_allocations(ai, apple, repeats, seed):
+    # Separate pass: tracemalloc slows every allocation down a lot
+    peaks = []
+    tracemalloc.start()
+    try:
+        for rep in range(repeats):
+            random.seed(seed + rep)
+            start_tick(ai)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            ai.get_next_move(apple)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+def run_benchmark(repeats=50, seed=0, board_sizes=BOARD_SIZES):
+    results = []
+    position_seed = seed
+    for width, height in board_sizes:
+        for length in SNAKE_LENGTHS:
+            for congestion, share in CONGESTION_LEVELS.items():
+                opponent_length = max(1, int(width * height * share))
+                position_seed += 1
+                for name, ai_class, difficulty in AIS:
+                    snake, opponent, apple = build_position(position_seed, width, height,
+                                                            length, opponent_length)
+                    ai = make_ai(ai_class, difficulty, snake, opponent)
+                    ai.get_next_move(apple)  # Warm up
+                    stats = summarize(time_decisions(ai, apple, repeats, position_seed))
+                    stats['alloc_peak_bytes'] = measure_allocations(ai, apple, max(1, repeats // 5),
+                                                                    position_seed)
+                    results.append({
+                        'ai': name,
+                        'board': f"{width}x{height}",
+                        'length': length,
+                        'congestion': congestion,
+                        **stats,
+                    })
+                    print(f"{name:24} {width}x{height} len={length:<4} {congestion:6} "
+                          f"mean={stats['mean']:9.1f}us p50={stats['p50']:9.1f}us "
+                          f"p99={stats['p99']:9.1f}us max={stats['max']:9.1f}us "
+                          f"alloc={stats['alloc_peak_bytes'] / 1024:7.1f}KiB")
+    return results
+
+def case_key(result):
+    return (result['ai'], result['board'], result['length'], result['congestion'])
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {case_key(r): r for r in json.load(f)['results']}
+    print(f"\n--- Compared with {baseline_path} (mean / p99, new / old) ---")
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old is None:
+            continue
+        print(f"{result['ai']:24} {result['board']} len={result['length']:<4} {result['congestion']:6} "
+              f"mean x{result['mean'] / old['mean']:5.2f}  p99 x{result['p99'] / old['p99']:5.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-AI move decision benchmark")
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    parser.add_argument('--boards', nargs='+', metavar='WxH',
+                        help="board sizes to sweep, e.g. --boards 40x30 100x100 (default: %(default)s)",
+                        default=[f"{w}x{h}" for w, h in BOARD_SIZES])
+    parser.add_argument('--bitboards', action='store_true',
+                        help="run every AI's bfs and flood fills on bitboards")
+    args = parser.parse_args()
+    SnakeAI.use_bitboards = args.bitboards
+
+    board_sizes = [tuple(int(n) for n in size.split('x')) for size in args.boards]
+    results = run_benchmark(args.repeats, args.seed, board_sizes)
+    with open(args.output, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeats': args.repeats,
+            'seed': args.seed,
+            'bitboards': args.bitboards,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
@@ -1,9 +1,8 @@
 from game.ai import SnakeAI
-from heapq import heappush, heappop
-from collections import deque
-import random
 
 class CycleSafeAStarAI(SnakeAI):
+    flood_fill_limit = 200
+
     def __init__(self, snake, opponent, difficulty='hard'):
         super().__init__(snake, opponent, difficulty)
         self.first_move_done = False
@@ -18,7 +17,8 @@ class CycleSafeAStarAI(SnakeAI):
         path = self.a_star(head, apple_pos)
         if path and len(path) > 1:
             next_pos = path[1]
-            if self.flood_fill_area(next_pos) >= len(self.snake.body):
+            # Out of budget, the path is the best move found so far
+            if self.flood_fill_area(next_pos) >= len(self.snake.body) or self.out_of_budget():
                 return (next_pos[0] - head[0], next_pos[1] - head[1])
 
         tail_path = self.a_star(head, self.snake.body[-1])
@@ -41,48 +41,8 @@ class CycleSafeAStarAI(SnakeAI):
             return (0, 1 if dy > 0 else -1)
         return self.snake.direction
 
-    def a_star(self, start, goal):
-        open_set = []
-        heappush(open_set, (self.heuristic(start, goal), 0, start, [start]))
-        visited = set()
-
-        while open_set:
-            _, cost, current, path = heappop(open_set)
-            if current == goal:
-                return path
-            if current in visited:
-                continue
-            visited.add(current)
-
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited:
-                    heappush(open_set, (
-                        cost + 1 + self.heuristic(neighbor, goal),
-                        cost + 1,
-                        neighbor,
-                        path + [neighbor]
-                    ))
-        return None
-
-    def flood_fill_area(self, start):
-        visited = set()
-        queue = deque([start])
-        area = 0
-
-        while queue and area < 200:
-            pos = queue.popleft()
-            if pos in visited:
-                continue
-            visited.add(pos)
-            area += 1
-            for neighbor in self.get_neighbors(pos):
-                if neighbor not in visited:
-                    queue.append(neighbor)
-
-        return area
-
     def get_safe_move(self):
         safe = self.get_safe_moves()
         if safe:
-            return random.choice(safe)
+            return self.rng.choice(safe)
         return self.snake.direction
@@ -0,0 +1,113 @@
+from game.ai import SnakeAI
+
+# (width, height) -> (cycle, position): the cells of a Hamiltonian cycle in
+# order, and each cell id's (x * height + y) place on it, -1 for cells it
+# leaves out. Built once per board size and shared by every HamiltonianAI.
+_cycles = {}
+
+def hamiltonian_cycle(width, height):
+    if (width, height) not in _cycles:
+        if height % 2 == 0:
+            cells = serpentine(width, height)
+        elif width % 2 == 0:
+            cells = [(x, y) for y, x in serpentine(height, width)]
+        else:
+            # Odd by odd boards have no Hamiltonian cycle; leave out the last row
+            cells = serpentine(width, height - 1)
+        position = [-1] * (width * height)
+        for index, (x, y) in enumerate(cells):
+            position[x * height + y] = index
+        _cycles[(width, height)] = cells, position
+    return _cycles[(width, height)]
+
+def serpentine(width, height):
+    # Rows back and forth over columns 1.. (height is even, so the last row
+    # ends next to column 0), then up column 0 to the start
+    if width < 2 or height < 2:
+        raise ValueError(f"no Hamiltonian cycle on a {width}x{height} board")
+    cells = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(height - 1, -1, -1))
+    return cells
+
+
+class HamiltonianAI(SnakeAI):
+    """Follows a Hamiltonian cycle of the board, taking shortcuts to the apple.
+
+    Moving to the next cell of the cycle can never trap a snake that is on
+    its own, however long it gets. While the snake is short it may jump ahead
+    to a neighbour further along the cycle, as long as the jump lands before
+    its own tail and not past the apple, which keeps the body in cycle order.
+    Each move is a table lookup plus a look at the four neighbours, whatever
+    the snake's length. Only when the other snake blocks the cycle does it
+    fall back to the safe move with the most room.
+    """
+
+    # No shortcuts once the snake covers this share of the cycle
+    shortcut_limit = 0.5
+
+    def __init__(self, snake, opponent, difficulty='hard'):
+        super().__init__(snake, opponent, difficulty)
+        self.cycle, self.position = hamiltonian_cycle(self.board.width, self.board.height)
+
+    def place(self, pos):
+        x, y = pos
+        if 0 <= x < self.board.width and 0 <= y < self.board.height:
+            return self.position[x * self.board.height + y]
+        return -1
+
+    def get_next_move(self, apple_pos):
+        body = self.snake.body
+        head = body[0]
+        size = len(self.cycle)
+        here = self.place(head)
+        if here < 0:
+            return self.get_roomiest_move()
+
+        # Cells ahead of the head that are clear of our own body
+        tail = self.place(body[-1])
+        room = (tail - here) % size if len(body) > 1 else size
+        apple = self.place(apple_pos)
+        apple_ahead = (apple - here) % size if apple >= 0 else 0
+        shortcuts = len(body) < size * self.shortcut_limit and apple_ahead > 1
+
+        # Step along the cycle, or the furthest safe jump that stays short
+        # of the apple and leaves a gap to the tail for growing
+        best, best_ahead = None, 0
+        for direction in self.directions():
+            pos = (head[0] + direction[0], head[1] + direction[1])
+            place = self.place(pos)
+            if place < 0:
+                continue
+            ahead = (place - here) % size
+            if ahead == 1:
+                if best is None and self.can_enter(pos):
+                    best, best_ahead = direction, ahead
+            elif (shortcuts and best_ahead < ahead <= apple_ahead and ahead < room - 2 and
+                    self.is_position_safe(pos)):
+                best, best_ahead = direction, ahead
+        return best if best is not None else self.get_roomiest_move()
+
+    def directions(self):
+        # A one-cell snake cannot turn back on itself either
+        back = (-self.snake.direction[0], -self.snake.direction[1])
+        return [d for d in ((0, -1), (0, 1), (-1, 0), (1, 0)) if d != back]
+
+    def can_enter(self, pos):
+        # Our own tail moves out of the way unless we are growing
+        if pos == self.snake.body[-1] and len(self.snake.body) > 1 and not self.snake.growing:
+            return not (self.target and self.target.occupies(pos))
+        return self.is_position_safe(pos)
+
+    def get_roomiest_move(self):
+        head = self.snake.body[0]
+        best, best_area = None, -1
+        for direction in self.directions():
+            if not self.is_move_safe(direction):
+                continue
+            area = self.flood_fill_area((head[0] + direction[0], head[1] + direction[1]))
+            if area > best_area:
+                best, best_area = direction, area
+        return best if best is not None else self.snake.direction
@@ -1,15 +1,12 @@
 from game.ai import SnakeAI
 from game.constants import *
-from collections import deque
-import random
 
 class PathfindingStrategicAI(SnakeAI):
     def get_next_move(self, apple_pos):
         head = self.snake.body[0]
-        path = self.bfs(head, apple_pos)
+        next_pos = self.next_step_to_apple(apple_pos)
 
-        if path and len(path) >= 2:
-            next_pos = path[1]
+        if next_pos:
             direction = (next_pos[0] - head[0], next_pos[1] - head[1])
             if self.is_move_safe(direction):
                 return direction
@@ -17,28 +14,6 @@ class PathfindingStrategicAI(SnakeAI):
         # No safe path: fallback to high-mobility move
         return self.get_mobility_fallback()
 
-    def bfs(self, start, goal):
-        queue = deque([start])
-        visited = {start: None}
-
-        while queue:
-            current = queue.popleft()
-
-            if current == goal:
-                # Reconstruct path
-                path = []
-                while current:
-                    path.append(current)
-                    current = visited[current]
-                return path[::-1]
-
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited:
-                    visited[neighbor] = current
-                    queue.append(neighbor)
-
-        return None  # No path
-
     def get_mobility_fallback(self):
         head = self.snake.body[0]
         best_move = self.snake.direction
@@ -50,8 +25,8 @@ class PathfindingStrategicAI(SnakeAI):
             score = future_options
 
             # Bias toward center to avoid edge traps
-            score += -abs(next_pos[0] - (GRID_WIDTH // 2)) * 0.1
-            score += -abs(next_pos[1] - (GRID_HEIGHT // 2)) * 0.1
+            score += -abs(next_pos[0] - (self.board.width // 2)) * 0.1
+            score += -abs(next_pos[1] - (self.board.height // 2)) * 0.1
 
             if score > max_future:
                 max_future = score
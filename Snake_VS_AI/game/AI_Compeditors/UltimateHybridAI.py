@@ -1,7 +1,4 @@
 from game.ai import SnakeAI
-from heapq import heappush, heappop
-from collections import deque
-import random
 
 class UltimateHybridAI(SnakeAI):
     def get_next_move(self, apple_pos):
@@ -10,7 +7,8 @@ class UltimateHybridAI(SnakeAI):
         path_to_apple = self.a_star(head, apple_pos)
         if path_to_apple and len(path_to_apple) > 1:
             next_pos = path_to_apple[1]
-            if self.safe_area(next_pos) > len(self.snake.body) * 1.1:
+            # Out of budget, the path is the best move found so far
+            if self.safe_area(next_pos) > len(self.snake.body) * 1.1 or self.out_of_budget():
                 return (next_pos[0] - head[0], next_pos[1] - head[1])
 
         path_to_tail = self.a_star(head, self.snake.body[-1])
@@ -20,43 +18,8 @@ class UltimateHybridAI(SnakeAI):
         # FIXED: move safely toward apple if possible
         return self.get_basic_direction(apple_pos)
 
-    def a_star(self, start, goal):
-        open_set = []
-        heappush(open_set, (self.heuristic(start, goal), 0, start, [start]))
-        visited = set()
-
-        while open_set:
-            _, cost, current, path = heappop(open_set)
-            if current == goal:
-                return path
-            if current in visited:
-                continue
-            visited.add(current)
-
-            for neighbor in self.get_neighbors(current):
-                if neighbor not in visited:
-                    heappush(open_set, (
-                        cost + 1 + self.heuristic(neighbor, goal),
-                        cost + 1,
-                        neighbor,
-                        path + [neighbor]
-                    ))
-        return None
-
     def safe_area(self, start):
-        visited = set()
-        queue = deque([start])
-        area = 0
-        while queue:
-            pos = queue.popleft()
-            if pos in visited:
-                continue
-            visited.add(pos)
-            area += 1
-            for neighbor in self.get_neighbors(pos):
-                if neighbor not in visited:
-                    queue.append(neighbor)
-        return area
+        return self.flood_fill_area(start)
 
     def get_basic_direction(self, target):
         head = self.snake.body[0]
@@ -79,5 +42,5 @@ class UltimateHybridAI(SnakeAI):
     def get_safe_move(self):
         safe_moves = self.get_safe_moves()
         if safe_moves:
-            return random.choice(safe_moves)
+            return self.rng.choice(safe_moves)
         return self.snake.direction
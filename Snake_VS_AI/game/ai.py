@@ -1,13 +1,53 @@
 from game.constants import *
-import heapq
+from game.pathfinding import Pathfinder, SearchBudget
+from game.bitboard import BitBoard
 import random
 
 class SnakeAI:
+    # Cap on flood_fill_area results; None fills the whole reachable area
+    flood_fill_limit = None
+    # Run bfs and flood fills on a BitBoard instead of cell by cell
+    use_bitboards = False
+
     def __init__(self, snake, target, difficulty='medium'):
         self.snake = snake
         self.target = target
         self.difficulty = difficulty
         self.last_direction = None
+        self.board = snake.board
+        self.pathfinder = Pathfinder(self.board.width, self.board.height)
+        self.bitboard = BitBoard(self.board.width, self.board.height)
+        # Shared DistanceField and SpaceAnalysis, set by the game when it has them
+        self.distance_field = None
+        self.space_analysis = None
+        self.budget = None
+        # Random stream for the AI's choices; games give each AI its own
+        self.rng = random
+        # get_neighbors answers, kept until either snake moves
+        self.cache_key = None
+        self.neighbor_cells = {}
+
+    def set_budget(self, ms=None, nodes=None):
+        """Limit each choose_move call to ms milliseconds and/or nodes expanded cells.
+
+        Searches that run out give up early and the AI falls back to the
+        best move it has so far. set_budget() with no limits removes it.
+        """
+        if ms is None and nodes is None:
+            self.budget = None
+        else:
+            self.budget = SearchBudget(self.search_nodes, ms, nodes)
+        self.pathfinder.budget = self.budget
+        self.bitboard.budget = self.budget
+
+    def out_of_budget(self):
+        return self.budget is not None and self.budget.exhausted()
+
+    def choose_move(self, apple_pos):
+        # get_next_move within the budget, if one is set
+        if self.budget is not None:
+            self.budget.start()
+        return self.get_next_move(apple_pos)
 
     def get_next_move(self, apple_pos):
         if self.difficulty == 'easy':
@@ -19,9 +59,9 @@ class SnakeAI:
 
     def get_easy_move(self, apple_pos):
         # Simple movement with 30% random direction
-        if random.random() < 0.3:
+        if self.rng.random() < 0.3:
             safe_moves = self.get_safe_moves()
-            return random.choice(safe_moves) if safe_moves else self.snake.direction
+            return self.rng.choice(safe_moves) if safe_moves else self.snake.direction
 
         return self.get_basic_direction(apple_pos)
 
@@ -47,9 +87,9 @@ class SnakeAI:
             score -= apple_distance * 2
 
             # Avoid walls - give higher scores to moves away from walls
-            if next_pos[0] > 0 and next_pos[0] < GRID_WIDTH - 1:
+            if next_pos[0] > 0 and next_pos[0] < self.board.width - 1:
                 score += 3
-            if next_pos[1] > 0 and next_pos[1] < GRID_HEIGHT - 1:
+            if next_pos[1] > 0 and next_pos[1] < self.board.height - 1:
                 score += 3
 
             # Look ahead for available moves from next position
@@ -57,11 +97,13 @@ class SnakeAI:
             score += future_moves * 2
 
             # Add some randomness to avoid predictable movement
-            score += random.uniform(0, 2)
+            score += self.rng.uniform(0, 2)
 
             if score > best_score:
                 best_score = score
                 best_move = move
+            if self.out_of_budget():
+                break
 
         return best_move if best_move else self.snake.direction
 
@@ -75,14 +117,21 @@ class SnakeAI:
 
         best_move = None
         best_score = float('-inf')
+        scored = 0
 
         for move in possible_moves:
             next_pos = (head[0] + move[0], head[1] + move[1])
             score = self.evaluate_move(next_pos, apple_pos)
+            scored += 1
             if score > best_score:
                 best_score = score
                 best_move = move
+            if self.out_of_budget():
+                break
 
+        # Out of budget before the first move could be weighed against another
+        if scored < min(2, len(possible_moves)):
+            return self.fallback_move()
         return best_move if best_move else self.get_safe_move()
 
     def evaluate_move(self, pos, apple_pos):
@@ -95,10 +144,9 @@ class SnakeAI:
         # Check if move blocks opponent
         if self.target and len(self.target.body) > 0:
             opponent_head = self.target.body[0]
-            opponent_to_apple = self.heuristic(opponent_head, apple_pos)
 
             # If we're closer to apple, prioritize getting it
-            if apple_distance < opponent_to_apple:
+            if self.is_closer_to_apple(pos, opponent_head, apple_pos):
                 score += 50
 
             # Bonus for blocking opponent's path to apple
@@ -116,7 +164,7 @@ class SnakeAI:
                 item_distance = self.heuristic(pos, item['pos'])
                 if self.difficulty == 'easy':
                     # Easy AI rarely goes for power-ups
-                    if random.random() < 0.2:
+                    if self.rng.random() < 0.2:
                         score -= item_distance
                 elif self.difficulty == 'medium':
                     # Medium AI goes for power-ups if they're convenient
@@ -139,6 +187,16 @@ class SnakeAI:
 
         return score
 
+    def is_closer_to_apple(self, pos, opponent_head, apple_pos):
+        distances = self.apple_distances(apple_pos)
+        if distances is None or not distances.holds(pos):
+            return self.heuristic(pos, apple_pos) < self.heuristic(opponent_head, apple_pos)
+
+        # Walking distances around both bodies, not straight-line ones
+        ours = distances.distance(pos)
+        theirs = distances.distance_from_head(opponent_head)
+        return ours is not None and (theirs is None or ours < theirs)
+
     def is_blocking_opponent(self, our_pos, opponent_pos, apple_pos):
         # Check if our position is between opponent and apple
         return (self.heuristic(opponent_pos, our_pos) + 
@@ -160,20 +218,96 @@ class SnakeAI:
 
     def is_position_safe(self, pos):
         # Modified to include edges (0 and max values)
-        return (0 <= pos[0] <= GRID_WIDTH - 1 and 
-                0 <= pos[1] <= GRID_HEIGHT - 1 and 
-                pos not in self.snake.body and
-                (not self.target or pos not in self.target.body))
+        return (0 <= pos[0] <= self.board.width - 1 and 
+                0 <= pos[1] <= self.board.height - 1 and 
+                not self.snake.occupies(pos) and
+                (not self.target or not self.target.occupies(pos)))
 
     def get_neighbors(self, pos):
-        x, y = pos
-        neighbors = []
-        for dx, dy in [UP, DOWN, LEFT, RIGHT]:
-            new_x, new_y = x + dx, y + dy
-            if self.is_position_safe((new_x, new_y)):
-                neighbors.append((new_x, new_y))
+        # Neighbour lists only change when a snake moves (or is loaded from
+        # another state), so they are kept until then. The list is shared by
+        # every caller, so do not change it.
+        key = (self.snake.moves, self.target.moves) if self.target else self.snake.moves
+        if key != self.cache_key:
+            self.cache_key = key
+            self.neighbor_cells = {}
+        neighbors = self.neighbor_cells.get(pos)
+        if neighbors is None:
+            x, y = pos
+            neighbors = self.neighbor_cells[pos] = []
+            for dx, dy in [UP, DOWN, LEFT, RIGHT]:
+                new_x, new_y = x + dx, y + dy
+                if self.is_position_safe((new_x, new_y)):
+                    neighbors.append((new_x, new_y))
         return neighbors
 
+    def blockers(self):
+        # Occupancy maps that searches have to route around
+        if self.target:
+            return (self.snake.occupied, self.target.occupied)
+        return (self.snake.occupied,)
+
+    def search_nodes(self):
+        # Cells expanded by this AI's own searches, what its budget counts
+        return self.pathfinder.expanded + self.bitboard.expanded
+
+    def shared_nodes(self):
+        # Cells expanded building the shared per-tick maps, by whichever AI asked first
+        return sum(shared.pathfinder.expanded for shared in (self.distance_field, self.space_analysis)
+                   if shared is not None)
+
+    def apple_distances(self, apple_pos):
+        # The game's shared per-tick distance map, if it provides one. Building
+        # it cannot stop halfway, so AIs on a budget only use a finished one.
+        if self.distance_field is None:
+            return None
+        if self.budget is not None and not self.distance_field.is_built(apple_pos):
+            return None
+        return self.distance_field.refresh(apple_pos)
+
+    def next_step_to_apple(self, apple_pos):
+        # First cell on a shortest path to the apple, or None if it is cut off
+        head = self.snake.body[0]
+        distances = self.apple_distances(apple_pos)
+        if distances is not None:
+            # The field may predate the other snake's move this tick; if that
+            # move could change the answer, search the live board instead
+            step = distances.next_step(head)
+            if distances.holds(step) if step is not None else not distances.moved_onto():
+                return step
+        path = self.bfs(head, apple_pos)
+        if path and len(path) >= 2:
+            return path[1]
+        return None
+
+    def free_bits(self):
+        return self.bitboard.free([self.snake, self.target] if self.target else [self.snake])
+
+    def bfs(self, start, goal):
+        if self.use_bitboards:
+            return self.bitboard.bfs(start, goal, self.free_bits())
+        return self.pathfinder.bfs(start, goal, self.blockers())
+
+    def a_star(self, start, goal):
+        return self.pathfinder.a_star(start, goal, self.blockers())
+
+    def flood_fill_area(self, start):
+        space = self.space_analysis
+        if space is not None:
+            space.refresh()
+            # A capped fill is cheaper than labelling a whole region, unless
+            # the region was already labelled earlier this tick. Labelling
+            # cannot stop halfway, so AIs on a budget only use finished labels.
+            uncapped = self.flood_fill_limit is None and self.budget is None
+            if uncapped or space.is_labelled(start):
+                area = space.area(start)
+                if self.flood_fill_limit is not None:
+                    area = min(area, self.flood_fill_limit)
+                return area
+        if self.use_bitboards:
+            return self.bitboard.flood_fill(start, self.free_bits(), self.flood_fill_limit)
+        return self.pathfinder.flood_fill(start, self.blockers(), self.flood_fill_limit)
+
     def get_basic_direction(self, target):
         head = self.snake.body[0]
         dx = target[0] - head[0]
@@ -201,10 +335,20 @@ class SnakeAI:
         else:
             return (0, 1 if dy > 0 else -1)
 
+    def fallback_move(self):
+        # For when there is no time to think: keep going if that is safe,
+        # else turn (never back, which change_direction would ignore)
+        direction = self.snake.direction
+        if self.is_move_safe(direction):
+            return direction
+        back = (-direction[0], -direction[1])
+        turns = [move for move in self.get_safe_moves() if move != back]
+        return self.rng.choice(turns) if turns else direction
+
     def get_safe_move(self):
         safe_moves = self.get_safe_moves()
         if safe_moves:
-            return random.choice(safe_moves)
+            return self.rng.choice(safe_moves)
         return self.snake.direction
 
     def get_visible_items(self):
@@ -0,0 +1,259 @@
+import time
+import numpy as np
+from game.constants import *
+
+# Lockstep simulator for many independent AI-vs-AI games at once.
+#
+# Every game follows the same rules as GameEngine in a tournament: snake 0
+# picks and makes its move, then snake 1 does, then apples and collisions
+# are resolved. Board state lives in NumPy arrays indexed by game, so a
+# tick costs a handful of array operations no matter how many games run.
+#
+# Bodies are not stored as lists. Each game has one byte per cell counting
+# the snakes on it, snake 0 in the low three bits and snake 1 in the next
+# three, so asking whether cells are free (or whose they are) is a single
+# gather for any number of cells. The grid has a border of OFF_BOARD cells
+# wide enough for every lookup the policies make, so there are no bounds
+# checks either. Each snake also keeps the cells it entered in a ring
+# indexed by move number, which is where the tail is looked up when it
+# falls off.
+
+# Same order as the [UP, DOWN, LEFT, RIGHT] loops in SnakeAI
+DIRECTIONS = np.array([UP, DOWN, LEFT, RIGHT])
+OPPOSITE = np.array([1, 0, 3, 2])
+COVER = (1, 8)  # What each snake adds to the cells it covers
+OFF_BOARD = 64  # Cover value of the border cells
+# Border width: a head that crashed out of bounds is one cell off the
+# board, and medium_policy looks two moves beyond a head
+PAD = 3
+# Per-game state, dropped for finished games by BatchSimulator.compact
+STATE_ARRAYS = ('cover', 'body', 'clock', 'length', 'growing', 'score', 'crashed',
+                'head', 'alive', 'ticks', 'ids', 'apple', 'direction')
+
+class BatchSimulator:
+    def __init__(self, n_games, policy1='medium', policy2='basic', max_apples=10,
+                 seed=None, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.n = n_games
+        self.width = width
+        self.height = height
+        self.max_apples = max_apples
+        self.policies = (POLICIES[policy1], POLICIES[policy2])
+        self.rng = np.random.default_rng(seed)
+        self.games = np.arange(n_games)
+
+        # Padded grid cell (y + PAD) * stride + x + PAD of board cell (x, y)
+        self.stride = width + 2 * PAD
+        grid = np.full((height + 2 * PAD, self.stride), OFF_BOARD, dtype=np.uint8)
+        grid[PAD:-PAD, PAD:-PAD] = 0
+        self.cover = np.tile(grid.reshape(-1), (n_games, 1))
+        self.flat_cover = self.cover.reshape(-1)
+        self.base = self.games * grid.size  # Offset of each game's grid
+        # Padded cell offset of a step in each direction
+        self.steps = DIRECTIONS[:, 1] * self.stride + DIRECTIONS[:, 0]
+        # Padded cell entered on each move, at move number % ring;
+        # a game ends before a snake outgrows the ring
+        self.ring = max_apples + 2
+        self.body = np.zeros((n_games, 2, self.ring), dtype=np.int32)
+        self.clock = np.zeros((n_games, 2), dtype=np.int32)
+        self.length = np.ones((n_games, 2), dtype=np.int32)
+        self.growing = np.zeros((n_games, 2), dtype=bool)
+        self.score = np.zeros((n_games, 2), dtype=np.int32)
+        self.crashed = np.zeros((n_games, 2), dtype=bool)
+
+        self.head = np.empty((n_games, 2, 2), dtype=np.int64)
+        self.head[:, 0] = (width // 4, height // 2)
+        self.head[:, 1] = (3 * width // 4, height // 2)
+        for s in range(2):
+            self.body[:, s, 0] = self.cell(self.head[:, s, 0], self.head[:, s, 1])
+            self.cover[self.games, self.body[:, s, 0]] += COVER[s]
+
+        self.alive = np.ones(n_games, dtype=bool)
+        self.ticks = np.zeros(n_games, dtype=np.int32)
+        # Results by original game number; the state arrays above shrink
+        # as games finish, and ids maps their rows back to game numbers
+        self.ids = np.arange(n_games)
+        self.winner = np.full(n_games, -1, dtype=np.int8)  # -1 while undecided
+        self.game_ticks = np.zeros(n_games, dtype=np.int32)
+
+        self.apple = np.empty((n_games, 2), dtype=np.int64)
+        self.spawn_apples(self.games)
+
+        # Start facing the apple, as simulate_game does
+        self.direction = np.full((n_games, 2), 3, dtype=np.int64)  # RIGHT
+        for s in range(2):
+            dx = self.apple[:, 0] - self.head[:, s, 0]
+            dy = self.apple[:, 1] - self.head[:, s, 1]
+            horizontal = np.abs(dx) > np.abs(dy)
+            self.direction[horizontal, s] = np.where(dx[horizontal] > 0, 3, 2)
+            vertical = ~horizontal & (dy != 0)
+            self.direction[vertical, s] = np.where(dy[vertical] > 0, 1, 0)
+
+    def cell(self, x, y):
+        return (y + PAD) * self.stride + (x + PAD)
+
+    def cover_of(self, cells):
+        """Cover values of padded cells, given with the game axis first."""
+        shape = (-1,) + (1,) * (cells.ndim - 1)
+        # Flat offsets into cover are much cheaper than 2-axis fancy indexing
+        return self.flat_cover[self.base.reshape(shape) + cells]
+
+    def cover_at(self, x, y):
+        return self.cover_of(self.cell(x, y))
+
+    def occupied_by(self, s, x, y):
+        """Whether snake s covers (x, y)."""
+        return (self.cover_at(x, y) >> (3 * s)) & 7 != 0
+
+    def is_free(self, x, y):
+        return self.cover_at(x, y) == 0
+
+    def candidates(self, s):
+        """Next head cells for each of the four directions, shape (n, 4)."""
+        x = self.head[:, s, 0, None] + DIRECTIONS[:, 0]
+        y = self.head[:, s, 1, None] + DIRECTIONS[:, 1]
+        return x, y
+
+    def random_safe_move(self, s, safe):
+        # Uniform choice among safe moves, current direction when boxed in
+        keys = np.where(safe, self.rng.random(safe.shape), -1.0)
+        return np.where(safe.any(axis=1), keys.argmax(axis=1), self.direction[:, s])
+
+    def spawn_apples(self, games):
+        pending = np.asarray(games)
+        while len(pending):
+            x = self.rng.integers(2, self.width - 2, len(pending))
+            y = self.rng.integers(2, self.height - 2, len(pending))
+            self.apple[pending, 0] = x
+            self.apple[pending, 1] = y
+            free = self.is_free(self.apple[:, 0], self.apple[:, 1])
+            pending = pending[~free[pending]]
+
+    def move(self, s, choice):
+        active = self.alive
+        # Prevent 180-degree turns
+        turn = active & (choice != OPPOSITE[self.direction[:, s]])
+        self.direction[turn, s] = choice[turn]
+
+        # Unless growing, the tail (entered length - 1 moves ago) moves on
+        leaving = active & ~self.growing[:, s]
+        tail = self.body[self.games, s, (self.clock[:, s] - self.length[:, s] + 1) % self.ring]
+        self.flat_cover[self.base[leaving] + tail[leaving]] -= COVER[s]
+
+        # Whole-column arithmetic: masked writes to one snake's column are slow
+        self.length[:, s] += self.growing[:, s] & active
+        self.growing[:, s] &= ~active
+        self.clock[:, s] += active
+        direction = self.direction[:, s]
+        self.head[:, s, 0] += DIRECTIONS[:, 0][direction] * active
+        self.head[:, s, 1] += DIRECTIONS[:, 1][direction] * active
+
+        x, y = self.head[:, s, 0], self.head[:, s, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        # Running into our own body; the tail cell was just vacated
+        hit_self = self.occupied_by(s, x, y)
+        self.crashed[:, s] = np.where(active, ~inside | hit_self, self.crashed[:, s])
+
+        write = np.flatnonzero(active & inside)
+        cells = self.cell(x[write], y[write])
+        self.body[write, s, self.clock[write, s] % self.ring] = cells
+        self.flat_cover[self.base[write] + cells] += COVER[s]
+
+    def step(self):
+        for s in range(2):
+            self.move(s, self.policies[s](self, s))
+
+        active = self.alive
+        self.ticks[active] += 1
+
+        eaten = np.zeros((self.n, 2), dtype=bool)
+        eaten[:, 0] = active & (self.head[:, 0] == self.apple).all(axis=1)
+        eaten[:, 1] = active & ~eaten[:, 0] & (self.head[:, 1] == self.apple).all(axis=1)
+        self.growing |= eaten
+        self.score += eaten
+        self.spawn_apples(self.games[eaten.any(axis=1)])
+
+        x, y = self.head[:, :, 0], self.head[:, :, 1]
+        crash1 = self.crashed[:, 0] | self.occupied_by(1, x[:, 0], y[:, 0])
+        crash2 = self.crashed[:, 1] | self.occupied_by(0, x[:, 1], y[:, 1])
+
+        winner = np.full(self.n, -1, dtype=np.int8)
+        winner[self.score[:, 1] >= self.max_apples] = 1
+        winner[self.score[:, 0] >= self.max_apples] = 0
+        winner[crash2] = 0
+        winner[crash1] = 1
+
+        done = active & (winner >= 0)
+        self.winner[self.ids[done]] = winner[done]
+        self.game_ticks[self.ids[done]] = self.ticks[done]
+        self.alive &= ~done
+
+        # Stop paying for finished games once they are the majority
+        if self.alive.sum() * 2 < self.n:
+            self.compact()
+
+    def compact(self):
+        keep = self.alive
+        for name in STATE_ARRAYS:
+            setattr(self, name, getattr(self, name)[keep])
+        self.flat_cover = self.cover.reshape(-1)
+        self.n = len(self.ids)
+        self.games = np.arange(self.n)
+        self.base = self.games * self.cover.shape[1]
+
+    def run(self, max_ticks=10000):
+        while self.n and self.ticks.max() < max_ticks:
+            self.step()
+        self.game_ticks[self.ids] = self.ticks
+        return self.winner
+
+
+def basic_policy(sim, s):
+    # Vectorised SnakeAI.get_basic_direction
+    dx = sim.apple[:, 0] - sim.head[:, s, 0]
+    dy = sim.apple[:, 1] - sim.head[:, s, 1]
+    preferred = np.where(np.abs(dx) > np.abs(dy),
+                         np.where(dx > 0, 3, 2),
+                         np.where(dy > 0, 1, 0))
+    x, y = sim.candidates(s)
+    safe = sim.is_free(x, y)
+    preferred_safe = safe[sim.games, preferred]
+    return np.where(preferred_safe, preferred, sim.random_safe_move(s, safe))
+
+def easy_policy(sim, s):
+    # Vectorised SnakeAI.get_easy_move: 30% random safe move
+    x, y = sim.candidates(s)
+    wander = sim.rng.random(sim.n) < 0.3
+    return np.where(wander, sim.random_safe_move(s, sim.is_free(x, y)), basic_policy(sim, s))
+
+def medium_policy(sim, s):
+    # Vectorised SnakeAI.get_medium_move scoring
+    x, y = sim.candidates(s)
+    cells = sim.cell(x, y)
+    safe = sim.cover_of(cells) == 0
+    apple_distance = (np.abs(x - sim.apple[:, 0, None]) +
+                      np.abs(y - sim.apple[:, 1, None]))
+    score = -2.0 * apple_distance
+    score += 3 * ((x > 0) & (x < sim.width - 1))
+    score += 3 * ((y > 0) & (y < sim.height - 1))
+    future_moves = (sim.cover_of(cells[:, :, None] + sim.steps) == 0).sum(axis=2)
+    score += future_moves * 2
+    score += sim.rng.uniform(0, 2, score.shape)
+    score[~safe] = -np.inf
+    return np.where(safe.any(axis=1), score.argmax(axis=1), sim.direction[:, s])
+
+POLICIES = {
+    'basic': basic_policy,
+    'easy': easy_policy,
+    'medium': medium_policy,
+}
+
+
+if __name__ == "__main__":
+    sim = BatchSimulator(2000, policy1='medium', policy2='basic', seed=0)
+    start = time.perf_counter()
+    winners = sim.run()
+    elapsed = time.perf_counter() - start
+    print(f"{len(winners)} games in {elapsed:.2f}s ({len(winners) / elapsed:.0f} games/sec)")
+    print("Policy 1 Wins:", int((winners == 0).sum()))
+    print("Policy 2 Wins:", int((winners == 1).sum()))
+    print("Undecided:", int((winners < 0).sum()))
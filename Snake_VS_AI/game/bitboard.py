@@ -0,0 +1,103 @@
+class BitBoard:
+    """One board size's cells as bits of a Python int, for whole-board search.
+
+    Cell (x, y) is bit x * stride + y, with stride = height + 1: every column
+    ends in a guard bit that is never free, so shifting a set of cells by 1
+    (a step up or down) or by stride (left or right) and masking with the
+    free cells drops whatever walked off the board. A flood fill or BFS then
+    grows its frontier one layer per handful of int operations instead of
+    looking at every cell in Python.
+
+    free(snakes) is the mask of cells not covered by any of the snakes; it
+    is rebuilt only after one of them has moved. As with Pathfinder, the
+    start cell itself is never checked.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.stride = height + 1
+        column = (1 << height) - 1
+        self.board = sum(column << (x * self.stride) for x in range(width))
+        self.free_key = None
+        self.free_cells = self.board
+        # Cells covered by searches, counted like Pathfinder.expanded
+        self.expanded = 0
+        self.budget = None
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def bit(self, pos):
+        return 1 << (pos[0] * self.stride + pos[1])
+
+    def mask(self, cells):
+        # Built as bytes and converted once, rather than OR-ing big ints per cell
+        bits = bytearray((self.width * self.stride + 7) // 8)
+        for x, y in cells:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                index = x * self.stride + y
+                bits[index >> 3] |= 1 << (index & 7)
+        return int.from_bytes(bits, 'little')
+
+    def free(self, snakes):
+        key = tuple(snake.moves for snake in snakes)
+        if key != self.free_key:
+            self.free_key = key
+            occupied = [snake.occupied for snake in snakes]
+            self.free_cells = self.board & ~self.mask(cell for cells in occupied for cell in cells)
+        return self.free_cells
+
+    def grow(self, cells, free):
+        stride = self.stride
+        return (cells << 1 | cells >> 1 | cells << stride | cells >> stride) & free
+
+    def flood_fill(self, start, free, limit=None):
+        """Same count as Pathfinder.flood_fill, one frontier layer at a time."""
+        if not self.in_bounds(start):
+            return 0
+        reached = frontier = self.bit(start)
+        count = 1
+        while frontier and (limit is None or count < limit):
+            # A layer is many cells at once, so the budget is checked every layer
+            if self.budget is not None and self.budget.exhausted(count):
+                break
+            frontier = self.grow(frontier, free) & ~reached
+            reached |= frontier
+            count = reached.bit_count()
+        self.expanded += count
+        return count if limit is None else min(count, limit)
+
+    def bfs(self, start, goal, free):
+        """A shortest path from start to goal as a list of cells, or None.
+
+        Ties between equally short paths may be broken differently from
+        Pathfinder.bfs.
+        """
+        if not (self.in_bounds(start) and self.in_bounds(goal)):
+            return None
+        goal_bit = self.bit(goal)
+        reached = frontier = self.bit(start)
+        layers = [frontier]
+        while not reached & goal_bit:
+            if self.budget is not None and self.budget.exhausted(reached.bit_count()):
+                frontier = 0
+            else:
+                frontier = self.grow(frontier, free) & ~reached
+            if not frontier:
+                self.expanded += reached.bit_count()
+                return None
+            reached |= frontier
+            layers.append(frontier)
+        self.expanded += reached.bit_count()
+
+        # Walk back from the goal through one cell of each earlier layer
+        path = [goal]
+        x, y = goal
+        for layer in reversed(layers[:-1]):
+            for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if self.in_bounds((nx, ny)) and layer & self.bit((nx, ny)):
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+        return path[::-1]
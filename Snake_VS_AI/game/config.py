@@ -0,0 +1,20 @@
+from game.constants import GRID_WIDTH, GRID_HEIGHT
+
+class BoardConfig:
+    """Board size in cells, read by the engine, the snakes and the AIs.
+
+    The default matches the 800x600 window; other sizes are for headless
+    runs (tournaments, benchmarks), since the renderer draws the window grid.
+    """
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+
+    def is_default(self):
+        return (self.width, self.height) == (GRID_WIDTH, GRID_HEIGHT)
+
+    def __repr__(self):
+        return f"BoardConfig({self.width}, {self.height})"
+
+DEFAULT_BOARD = BoardConfig()
@@ -15,6 +15,7 @@ BLUE = (0, 0, 255)
 # Game settings
 FPS = 60
 SNAKE_SPEED = 5  # Reduced from 10 to 5 for slower movement
+AI_MOVE_BUDGET_SHARE = 0.5  # Share of a tick an AI may think for in the game
 
 # Directions
 UP = (0, -1)
@@ -0,0 +1,177 @@
+import random
+from game.constants import *
+from game.config import DEFAULT_BOARD
+from game.snake import Snake
+from game.powerup import PowerUp, PowerUpEffect
+from game.free_cells import FreeCells
+from game.pathfinding import DistanceField, SpaceAnalysis
+from game.replay import pack_move
+
+class GameEngine:
+    """Game rules without any drawing, shared by main.py and the tournament.
+
+    A tick is one or more move() calls followed by update(). winner is the
+    index of the winning snake (0 or 1), or None for a single-player crash
+    or a game ended by declare_draw.
+    Apples only spawn two or more cells in from the walls. If that spawn
+    area has no free cell left for a new apple, the snake that ate the last
+    one wins, even though the board itself is not full. Boards whose spawn
+    area cannot hold target_apples apples are rejected.
+
+    All of the engine's randomness comes from its own stream seeded by
+    `seed` (a random one if not given), so the same seed and moves always
+    replay the same game. rng_for gives the AIs their own streams of it.
+    """
+
+    def __init__(self, versus=True, target_apples=10, power_ups_enabled=False,
+                 colors=(GREEN, BLUE), board=DEFAULT_BOARD, seed=None, recorder=None):
+        self.board = board
+        self.seed = random.randrange(2**64) if seed is None else seed
+        self.rng = self.rng_for('engine')
+        width, height = board.width, board.height
+        self.snakes = [Snake(width // 4, height // 2, colors[0], board),
+                       Snake(3 * width // 4, height // 2, colors[1], board)]
+        self.versus = versus
+        self.target_apples = target_apples
+        self.power_ups_enabled = power_ups_enabled
+        self.power_ups = []
+        self.effects = [[], []]  # Freeze effects currently on each snake
+        # Shared with the AIs: walking distances to the apple and free-space regions
+        self.distance_field = DistanceField(self.snakes, width, height)
+        self.space_analysis = SpaceAnalysis(self.snakes, width, height)
+        self.tick = 0
+        self.game_over = False
+        self.winner = None
+
+        # Cells apples and power-ups can spawn on (two in from the walls)
+        self.free_cells = FreeCells(2, 2, width - 3, height - 3)
+        for snake in self.snakes:
+            for cell in snake.occupied:
+                self.free_cells.take(cell)
+            snake.free_cells = self.free_cells
+
+        if len(self.free_cells) < max(target_apples, 1):
+            raise ValueError(f"the spawn area of a {width}x{height} board has room for "
+                             f"{len(self.free_cells)} apples, not {target_apples}")
+        self.apple = self.spawn_apple()
+        if power_ups_enabled:
+            self.spawn_power_up()
+
+        # Optional ReplayRecorder, fed the packed moves of every tick
+        self.recorder = recorder
+        self.tick_moves = bytearray(2)
+        if recorder is not None:
+            recorder.start_game(self)
+
+    def rng_for(self, name):
+        # Independent stream per name, so an AI drawing more or fewer numbers
+        # never shifts the apples (or the other AI's choices)
+        return random.Random(f"{self.seed}:{name}")
+
+    def save_state(self):
+        """Snapshot of everything update() depends on, for replay keyframes."""
+        return (self.tick, self.apple, self.game_over, self.winner, self.rng.getstate(),
+                [snake.save_state() for snake in self.snakes], self.free_cells.save_state(),
+                [power_up.position for power_up in self.power_ups],
+                [[effect.remaining for effect in effects] for effects in self.effects])
+
+    def load_state(self, state):
+        (self.tick, self.apple, self.game_over, self.winner, rng_state,
+         snakes, free_cells, power_ups, effects) = state
+        for snake, snake_state in zip(self.snakes, snakes):
+            snake.load_state(snake_state)
+        # Restored as saved: spawning depends on the order of the free cells
+        self.free_cells.load_state(free_cells)
+        self.power_ups = [PowerUp(self.board, self.rng, position) for position in power_ups]
+        self.effects = [[PowerUpEffect(left) for left in remaining] for remaining in effects]
+        self.rng.setstate(rng_state)
+        self.distance_field.key = None
+        self.distance_field.next_tick()
+        self.space_analysis.key = None
+
+    def spawn_apple(self):
+        """Random free cell for the next apple, or None if the spawn area is full."""
+        return self.free_cells.sample(self.rng)
+
+    def spawn_power_up(self):
+        if len(self.power_ups) < 2:  # Maximum 2 power-ups at a time
+            position = self.free_cells.sample(self.rng, exclude=self.apple)
+            if position is not None:
+                self.power_ups.append(PowerUp(self.board, self.rng, position))
+
+    def is_occupied(self, pos):
+        return any(snake.occupies(pos) for snake in self.snakes)
+
+    def is_frozen(self, index):
+        return any(effect.remaining > 0 for effect in self.effects[index])
+
+    def update_effects(self):
+        self.effects = [[effect for effect in effects if effect.update()]
+                        for effects in self.effects]
+
+    def move(self, index, direction=None):
+        snake = self.snakes[index]
+        if direction is not None:
+            snake.change_direction(direction)
+        snake.move()
+        if self.recorder is not None:
+            self.tick_moves[index] = pack_move(snake.direction)
+
+    def update(self):
+        """Apply collisions, apples, power-ups and the win condition."""
+        self.tick += 1
+        snake1, snake2 = self.snakes
+        active = self.snakes if self.versus else self.snakes[:1]
+
+        if snake1.check_collision(snake2 if self.versus else None):
+            self.game_over = True
+            self.winner = 1 if self.versus else None
+        elif self.versus and snake2.check_collision(snake1):
+            self.game_over = True
+            self.winner = 0
+
+        for index, snake in enumerate(active):
+            if snake.body[0] == self.apple:
+                snake.grow()
+                apple = self.spawn_apple()
+                if apple is None:
+                    # Spawn area exhausted: this snake ate the last apple
+                    if not self.game_over:
+                        self.game_over = True
+                        self.winner = index
+                    break
+                self.apple = apple
+                if self.power_ups_enabled and self.rng.random() < 0.3:  # 30% chance to spawn power-up
+                    self.spawn_power_up()
+                break
+
+        # Collecting a power-up freezes the other snake
+        if self.power_ups_enabled:
+            for power_up in self.power_ups[:]:
+                for index, snake in enumerate(active):
+                    if snake.body[0] == power_up.position:
+                        self.effects[1 - index].append(PowerUpEffect())
+                        self.power_ups.remove(power_up)
+                        break
+
+        if not self.game_over:
+            for index, snake in enumerate(active):
+                if snake.score >= self.target_apples:
+                    self.game_over = True
+                    self.winner = index
+                    break
+
+        self.distance_field.next_tick()
+        if self.recorder is not None:
+            self.recorder.record_tick(self.tick_moves)
+            self.tick_moves = bytearray(2)
+            if self.game_over:
+                self.recorder.end_game(self)
+        return self.game_over
+
+    def declare_draw(self):
+        """End an unfinished game with no winner, e.g. at a tournament's tick limit."""
+        self.game_over = True
+        self.winner = None
+        if self.recorder is not None:
+            self.recorder.end_game(self)
@@ -0,0 +1,79 @@
+# (left, top, right, bottom) -> (cells, position, covered) of an empty
+# rectangle; every FreeCells on it starts from copies of these
+_empty = {}
+
+def empty_rectangle(left, top, right, bottom):
+    bounds = (left, top, right, bottom)
+    if bounds not in _empty:
+        # Bounds are inclusive
+        cells = tuple((x, y) for x in range(left, right + 1) for y in range(top, bottom + 1))
+        position = {cell: index for index, cell in enumerate(cells)}
+        _empty[bounds] = cells, position, dict.fromkeys(cells, 0)
+    return _empty[bounds]
+
+
+class FreeCells:
+    """Cells of a rectangle that no snake covers, with O(1) updates and sampling.
+
+    The free cells live in a list in no particular order, plus a map from
+    each cell to its index, so taking a cell swaps it with the last entry
+    and pops. Snakes call take/release as their heads enter and their tails
+    leave cells; `covered` counts the snakes on each cell of the rectangle
+    (one can move onto the other's tail cell before that tail moves on).
+    The list order only depends on the moves made, so seeded games sample
+    the same cells every time.
+    """
+
+    def __init__(self, left, top, right, bottom):
+        # Bounds are inclusive
+        cells, position, covered = empty_rectangle(left, top, right, bottom)
+        self.cells = list(cells)
+        self.position = position.copy()
+        self.covered = covered.copy()
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, pos):
+        return pos in self.position
+
+    def take(self, pos):
+        count = self.covered.get(pos)
+        if count is None:  # Outside the rectangle
+            return
+        self.covered[pos] = count + 1
+        if count == 0:
+            index = self.position.pop(pos)
+            last = self.cells.pop()
+            if last != pos:
+                self.cells[index] = last
+                self.position[last] = index
+
+    def release(self, pos):
+        count = self.covered.get(pos)
+        if count is None:
+            return
+        self.covered[pos] = count - 1
+        if count == 1:
+            self.position[pos] = len(self.cells)
+            self.cells.append(pos)
+
+    def sample(self, rng, exclude=None):
+        """Uniformly random free cell other than exclude, or None if there is none."""
+        count = len(self.cells)
+        skip = self.position.get(exclude)
+        if skip is None:
+            return self.cells[rng.randrange(count)] if count else None
+        if count == 1:
+            return None
+        index = rng.randrange(count - 1)
+        return self.cells[index + 1 if index >= skip else index]
+
+    def save_state(self):
+        return tuple(self.cells), dict(self.covered)
+
+    def load_state(self, state):
+        cells, covered = state
+        self.cells = list(cells)
+        self.position = {cell: index for index, cell in enumerate(self.cells)}
+        self.covered = dict(covered)
@@ -1,10 +1,11 @@
-import pygame
 from game.constants import *
+from game.renderer import label
+
+FONT_SIZE = 48
+SMALL_FONT_SIZE = 36
 
 class Menu:
     def __init__(self):
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
         self.difficulty_options = ['easy', 'medium', 'hard']
         self.current_difficulty = 1  # Default to medium
         self.speed_options = ['Slow', 'Normal', 'Fast']
@@ -36,25 +37,25 @@ class Menu:
     def draw(self, screen, selected_option=0):
         screen.fill(BLACK)
 
-        title = self.font.render("Snake Game", True, WHITE)
+        title = label("Snake Game", FONT_SIZE, WHITE)
         screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         options = ["Single Player", "VS AI", "Customize Colors", "Quit"]
         for i, option in enumerate(options):
             color = GREEN if i == selected_option else WHITE
-            text = self.font.render(option, True, color)
+            text = label(option, FONT_SIZE, color)
             screen.blit(text, (WINDOW_WIDTH//2 - text.get_width()//2, 250 + i * 60))
 
     def draw_color_selector(self, screen, current_item=0):
         screen.fill(BLACK)
 
         # Title at the top
-        title = self.font.render("Color Customization", True, WHITE)
+        title = label("Color Customization", FONT_SIZE, WHITE)
         title_rect = title.get_rect(center=(WINDOW_WIDTH//2, 100))
         screen.blit(title, title_rect)
 
         # Instructions between title and options
-        instructions = self.small_font.render("Use LEFT/RIGHT to change color, UP/DOWN to select item", True, WHITE)
+        instructions = label("Use LEFT/RIGHT to change color, UP/DOWN to select item", SMALL_FONT_SIZE, WHITE)
         instructions_rect = instructions.get_rect(center=(WINDOW_WIDTH//2, 170))
         screen.blit(instructions, instructions_rect)
 
@@ -63,61 +64,61 @@ class Menu:
         start_y = 250  # Start items after instructions
         for i, item in enumerate(items):
             color = GREEN if i == current_item else WHITE
-            text = self.font.render(item, True, color)
+            text = label(item, FONT_SIZE, color)
             text_rect = text.get_rect(center=(WINDOW_WIDTH//2, start_y + i * 60))
             screen.blit(text, text_rect)
 
     def draw_special_abilities_selector(self, screen):
         screen.fill(BLACK)
 
-        title = self.font.render("Enable Special Abilities?", True, WHITE)
+        title = label("Enable Special Abilities?", FONT_SIZE, WHITE)
         screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         options = ["Yes", "No"]
         for i, option in enumerate(options):
             color = GREEN if (i == 0) == self.special_abilities_enabled else WHITE
-            text = self.font.render(option, True, color)
+            text = label(option, FONT_SIZE, color)
             screen.blit(text, (WINDOW_WIDTH//2 - text.get_width()//2, 250 + i * 60))
 
-        instructions = self.small_font.render("Use UP/DOWN to change, ENTER to confirm", True, WHITE)
+        instructions = label("Use UP/DOWN to change, ENTER to confirm", SMALL_FONT_SIZE, WHITE)
         screen.blit(instructions, (WINDOW_WIDTH//2 - instructions.get_width()//2, 450))
 
     def draw_difficulty_selector(self, screen):
         screen.fill(BLACK)
 
-        title = self.font.render("Select AI Difficulty", True, WHITE)
+        title = label("Select AI Difficulty", FONT_SIZE, WHITE)
         screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         for i, diff in enumerate(self.difficulty_options):
             color = GREEN if i == self.current_difficulty else WHITE
-            text = self.font.render(diff.capitalize(), True, color)
+            text = label(diff.capitalize(), FONT_SIZE, color)
             screen.blit(text, (WINDOW_WIDTH//2 - text.get_width()//2, 250 + i * 60))
 
-        instructions = self.small_font.render("Use UP/DOWN to change, ENTER to confirm", True, WHITE)
+        instructions = label("Use UP/DOWN to change, ENTER to confirm", SMALL_FONT_SIZE, WHITE)
         screen.blit(instructions, (WINDOW_WIDTH//2 - instructions.get_width()//2, 450))
 
     def draw_speed_selector(self, screen):
         screen.fill(BLACK)
 
-        title = self.font.render("Select Snake Speed", True, WHITE)
+        title = label("Select Snake Speed", FONT_SIZE, WHITE)
         screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
         for i, speed in enumerate(self.speed_options):
             color = GREEN if i == self.current_speed else WHITE
-            text = self.font.render(speed, True, color)
+            text = label(speed, FONT_SIZE, color)
             screen.blit(text, (WINDOW_WIDTH//2 - text.get_width()//2, 250 + i * 60))
 
-        instructions = self.small_font.render("Use UP/DOWN to change, ENTER to confirm", True, WHITE)
+        instructions = label("Use UP/DOWN to change, ENTER to confirm", SMALL_FONT_SIZE, WHITE)
         screen.blit(instructions, (WINDOW_WIDTH//2 - instructions.get_width()//2, 450))
 
     def draw_win_condition_selector(self, screen, apples):
         screen.fill(BLACK)
 
-        title = self.font.render("Select Apple Target", True, WHITE)
+        title = label("Select Apple Target", FONT_SIZE, WHITE)
         screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 100))
 
-        value = self.font.render(str(apples), True, GREEN)
+        value = label(str(apples), FONT_SIZE, GREEN)
         screen.blit(value, (WINDOW_WIDTH//2 - value.get_width()//2, 250))
 
-        instructions = self.small_font.render("Use UP/DOWN to change, ENTER to start", True, WHITE)
+        instructions = label("Use UP/DOWN to change, ENTER to start", SMALL_FONT_SIZE, WHITE)
         screen.blit(instructions, (WINDOW_WIDTH//2 - instructions.get_width()//2, 350))
\ No newline at end of file
@@ -0,0 +1,152 @@
+import math
+import time
+from statistics import NormalDist
+
+# Statistics helpers shared by the benchmark and the decision timing reports
+
+def percentile(sorted_samples, q):
+    """Nearest-rank percentile (q in 0..100) of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = round(q / 100 * (len(sorted_samples) - 1))
+    return sorted_samples[index]
+
+def summarize(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'count': len(samples),
+        'mean': sum(samples) / len(samples),
+        'p50': percentile(samples, 50),
+        'p99': percentile(samples, 99),
+        'max': samples[-1],
+    }
+
+def win_rate_interval(score, games, confidence=0.95):
+    """Wilson score interval for a win rate of score / games (draws count half)."""
+    if games == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = score / games
+    centre = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = z / (1 + z * z / games) * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+# SequentialTest.decision() once neither player is stronger by the margin
+EVEN = 2
+
+class SequentialTest:
+    """Two-sided sequential probability ratio test for stopping a match-up early.
+
+    Two one-sided tests run side by side, "player 0 wins with probability
+    0.5" against "0.5 + margin" and against "0.5 - margin", each updated
+    after every game. A side that rejects 0.5 decides for that player; a
+    side that accepts 0.5 stops, and once both have, the players are
+    EVEN. The chance of a wrong verdict is at most 1 - confidence. Draws
+    carry no evidence either way. The closer the players are to the
+    margin, the more games it takes, so callers still cap the number of
+    games.
+    """
+
+    def __init__(self, confidence=0.95, margin=0.1):
+        self.confidence = confidence
+        error = 1 - confidence
+        # The error is split between the two sides
+        self.upper = math.log((1 - error) / (error / 2))
+        self.lower = math.log(error / (1 - error / 2))
+        # (log ratio step for a player 0 win, for a loss) of each side
+        self.steps = [(math.log((0.5 + sign * margin) / 0.5), math.log((0.5 - sign * margin) / 0.5))
+                      for sign in (1, -1)]
+        self.llr = [0.0, 0.0]
+        self.even = [False, False]  # Sides that have accepted 0.5
+        self.stronger = None
+        self.results = [0, 0, 0]  # Wins for player 0, player 1, draws
+
+    @property
+    def games(self):
+        return sum(self.results)
+
+    def add(self, winner):
+        """Count a game won by player 0 or 1, or drawn (None)."""
+        if winner is None:
+            self.results[2] += 1
+            return
+        self.results[winner] += 1
+        if self.decision() is not None:
+            return
+        for side, (win_step, loss_step) in enumerate(self.steps):
+            if self.even[side]:
+                continue
+            self.llr[side] += win_step if winner == 0 else loss_step
+            if self.llr[side] >= self.upper:
+                self.stronger = side
+                return
+            if self.llr[side] <= self.lower:
+                self.even[side] = True
+
+    def decision(self):
+        """The stronger player (0 or 1), EVEN, or None while undecided."""
+        if self.stronger is not None:
+            return self.stronger
+        if all(self.even):
+            return EVEN
+        return None
+
+    def interval(self):
+        wins, _, draws = self.results
+        return win_rate_interval(wins + draws / 2, self.games, self.confidence)
+
+
+# Player field of the records for shared map rebuilds
+SHARED = None
+
+class DecisionTimer:
+    """Optional instrumentation around AI.choose_move.
+
+    Each decision is recorded as (tick, player, milliseconds, nodes), where
+    nodes is the number of cells the AI's own searches and flood fills
+    expanded while deciding. Rebuilding the shared per-tick maps is work
+    for both AIs, whichever one happens to trigger it, so it is recorded
+    separately as (tick, SHARED, 0.0, nodes). Games without a timer call
+    choose_move directly, so switching instrumentation off costs nothing
+    but an `if`.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def decide(self, ai, player, tick, apple_pos):
+        nodes, shared = ai.search_nodes(), ai.shared_nodes()
+        start = time.perf_counter()
+        move = ai.choose_move(apple_pos)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.records.append((tick, player, elapsed, ai.search_nodes() - nodes))
+        shared = ai.shared_nodes() - shared
+        if shared:
+            self.records.append((tick, SHARED, 0.0, shared))
+        return move
+
+    def merge(self, records):
+        self.records.extend(records)
+
+    def summary(self, player):
+        records = [r for r in self.records if r[1] == player]
+        return {
+            'ms': summarize([r[2] for r in records]),
+            'nodes': summarize([r[3] for r in records]),
+            'slowest_tick': max(records, key=lambda r: r[2])[0] if records else None,
+        }
+
+    def report(self, player, name):
+        summary = self.summary(player)
+        ms, nodes = summary['ms'], summary['nodes']
+        return (f"{name}: {ms['count']} moves, p50 {ms['p50']:.2f}ms, p99 {ms['p99']:.2f}ms, "
+                f"max {ms['max']:.2f}ms (tick {summary['slowest_tick']}), "
+                f"nodes p50 {nodes['p50']:.0f} / max {nodes['max']:.0f}")
+
+    def shared_report(self):
+        nodes = self.summary(SHARED)['nodes']
+        return (f"shared maps: {nodes['count']} rebuilds, "
+                f"nodes p50 {nodes['p50']:.0f} / max {nodes['max']:.0f}")
@@ -0,0 +1,443 @@
+import time
+from heapq import heappush, heappop
+
+# Searches look at their budget once every this many expanded cells
+BUDGET_CHECK_INTERVAL = 32
+
+
+class SearchBudget:
+    """Per-move limit on wall time (ms) and/or expanded cells (nodes).
+
+    start() is called at the beginning of each move; `spent` returns the
+    running total of cells the AI's own searches expanded so far
+    (SnakeAI.search_nodes). The shared per-tick maps are left out: both
+    AIs read them, and whichever happened to build them first would
+    otherwise pay for both.
+    """
+
+    def __init__(self, spent, ms=None, nodes=None):
+        self.spent = spent
+        self.ms = ms
+        self.nodes = nodes
+        self.deadline = None
+        self.node_limit = None
+
+    def start(self):
+        if self.ms is not None:
+            self.deadline = time.perf_counter() + self.ms / 1000
+        if self.nodes is not None:
+            self.node_limit = self.spent() + self.nodes
+
+    def exhausted(self, in_progress=0):
+        # in_progress: cells expanded by a search that has not finished yet
+        if self.node_limit is not None and self.spent() + in_progress >= self.node_limit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+# (width, height) -> (cells, neighbors); read-only, so every Pathfinder on
+# a board size shares them instead of rebuilding them per AI
+_tables = {}
+
+def board_tables(width, height):
+    if (width, height) not in _tables:
+        cells = [(cell // height, cell % height) for cell in range(width * height)]
+        # Neighbours in the same UP, DOWN, LEFT, RIGHT order as SnakeAI
+        neighbors = [[nx * height + ny
+                      for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+                      if 0 <= nx < width and 0 <= ny < height]
+                     for x, y in cells]
+        _tables[(width, height)] = cells, neighbors
+    return _tables[(width, height)]
+
+
+class Pathfinder:
+    """BFS, A* and flood fill over one board size, shared by all the AIs.
+
+    Cells are integer ids (x * height + y, so ids sort like (x, y) tuples).
+    Searches keep parent links instead of copying paths, and the visited,
+    parent and queue buffers are allocated once and reused: a cell counts as
+    visited only if its mark equals the current search's stamp, so nothing
+    has to be cleared between calls.
+
+    `blocked` is any collection of occupancy maps (Snake.occupied); a cell is
+    walkable when it is on the board and in none of them. The start cell is
+    never checked, matching SnakeAI.get_neighbors.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.cells, self.neighbors = board_tables(width, height)
+        self.mark = [0] * size
+        self.parent = [0] * size
+        self.queue = [0] * size
+        self.stamp = 0
+        # Running total of cells expanded by every search, for instrumentation
+        self.expanded = 0
+        # SearchBudget, if any: searches that run out of it give up early
+        self.budget = None
+
+    def cell_id(self, pos):
+        return pos[0] * self.height + pos[1]
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def next_stamp(self):
+        self.stamp += 1
+        return self.stamp
+
+    def first_check(self):
+        # Expansion count at which to look at the budget first (never, without one)
+        return BUDGET_CHECK_INTERVAL if self.budget is not None else len(self.cells) + 1
+
+    def path_to(self, cell):
+        # Walk parent links back to the start (the cell that is its own parent)
+        path = [self.cells[cell]]
+        while self.parent[cell] != cell:
+            cell = self.parent[cell]
+            path.append(self.cells[cell])
+        return path[::-1]
+
+    def bfs(self, start, goal, blocked):
+        if not (self.in_bounds(start) and self.in_bounds(goal)):
+            return None
+        stamp = self.next_stamp()
+        mark, parent, queue = self.mark, self.parent, self.queue
+        neighbors, cells = self.neighbors, self.cells
+        start_id = self.cell_id(start)
+        goal_id = self.cell_id(goal)
+        mark[start_id] = stamp
+        parent[start_id] = start_id
+        queue[0] = start_id
+        head, tail = 0, 1
+        check_at = self.first_check()
+
+        while head < tail:
+            if head == check_at:
+                if self.budget.exhausted(head):
+                    break
+                check_at += BUDGET_CHECK_INTERVAL
+            current = queue[head]
+            head += 1
+            if current == goal_id:
+                self.expanded += head
+                return self.path_to(current)
+            for neighbor in neighbors[current]:
+                if mark[neighbor] == stamp:
+                    continue
+                pos = cells[neighbor]
+                for occupied in blocked:
+                    if pos in occupied:
+                        break
+                else:
+                    mark[neighbor] = stamp
+                    parent[neighbor] = current
+                    queue[tail] = neighbor
+                    tail += 1
+        self.expanded += head
+        return None
+
+    def a_star(self, start, goal, blocked):
+        if not (self.in_bounds(start) and self.in_bounds(goal)):
+            return None
+        stamp = self.next_stamp()
+        mark, parent, neighbors, cells = self.mark, self.parent, self.neighbors, self.cells
+        goal_x, goal_y = goal
+        start_id = self.cell_id(start)
+        goal_id = self.cell_id(goal)
+        open_set = []
+        heappush(open_set, (abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start_id, start_id))
+
+        expanded = 0
+        check_at = self.first_check()
+        while open_set:
+            if expanded == check_at:
+                if self.budget.exhausted(expanded):
+                    break
+                check_at += BUDGET_CHECK_INTERVAL
+            _, cost, current, came_from = heappop(open_set)
+            if mark[current] == stamp:
+                continue
+            mark[current] = stamp
+            parent[current] = came_from
+            expanded += 1
+            if current == goal_id:
+                self.expanded += expanded
+                return self.path_to(current)
+
+            for neighbor in neighbors[current]:
+                if mark[neighbor] == stamp:
+                    continue
+                pos = cells[neighbor]
+                for occupied in blocked:
+                    if pos in occupied:
+                        break
+                else:
+                    heappush(open_set, (
+                        cost + 1 + abs(pos[0] - goal_x) + abs(pos[1] - goal_y),
+                        cost + 1,
+                        neighbor,
+                        current
+                    ))
+        self.expanded += expanded
+        return None
+
+    def flood_fill(self, start, blocked, limit=None):
+        """Size of the walkable area reachable from start, capped at limit.
+
+        Out of budget, this is the number of cells found so far.
+        """
+        if not self.in_bounds(start):
+            return 0
+        if limit is None:
+            limit = len(self.cells)
+        stamp = self.next_stamp()
+        mark, queue, neighbors, cells = self.mark, self.queue, self.neighbors, self.cells
+        start_id = self.cell_id(start)
+        mark[start_id] = stamp
+        queue[0] = start_id
+        head, tail = 0, 1
+        check_at = self.first_check()
+
+        while head < tail and tail < limit:
+            if head == check_at:
+                if self.budget.exhausted(head):
+                    break
+                check_at += BUDGET_CHECK_INTERVAL
+            current = queue[head]
+            head += 1
+            for neighbor in neighbors[current]:
+                if mark[neighbor] == stamp:
+                    continue
+                pos = cells[neighbor]
+                for occupied in blocked:
+                    if pos in occupied:
+                        break
+                else:
+                    mark[neighbor] = stamp
+                    queue[tail] = neighbor
+                    tail += 1
+        self.expanded += head
+        return min(tail, limit)
+
+
+class DistanceField:
+    """Walking distance from every free cell to the apple.
+
+    One reverse BFS from the apple answers "how far is X from the apple" for
+    every cell, so both AIs can share it instead of each searching. It is
+    built on the first lookup of a tick and reused for the rest of that tick
+    (and after it, while the apple and snakes stay put), so the second snake
+    to decide reads a field from before the first one moved. holds() tells
+    whether an answer is still right on the live board.
+    """
+
+    def __init__(self, snakes, width, height):
+        self.snakes = snakes
+        self.pathfinder = Pathfinder(width, height)
+        self.distance_to = [0] * (width * height)
+        self.apple = None
+        # (apple, each snake's move counter) the field was built for
+        self.key = None
+        self.expired = True
+        self.stamp = 0
+
+    def next_tick(self):
+        self.expired = True
+
+    def is_built(self, apple):
+        """Whether refresh(apple) would reuse the field rather than rebuild it."""
+        if self.key is None or apple != self.apple:
+            return False
+        return not self.expired or self.key == (apple,) + tuple(snake.moves for snake in self.snakes)
+
+    def refresh(self, apple):
+        if not self.is_built(apple):
+            self.build(apple)
+        self.expired = False
+        return self
+
+    def build(self, apple):
+        self.key = (apple,) + tuple(snake.moves for snake in self.snakes)
+        self.apple = apple
+
+        finder = self.pathfinder
+        self.stamp = stamp = finder.next_stamp()
+        if not finder.in_bounds(apple):
+            return
+        mark, queue, neighbors = finder.mark, finder.queue, finder.neighbors
+        distance_to = self.distance_to
+        height = finder.height
+
+        # Pre-mark the bodies as seen (with no distance) so the BFS below
+        # never has to look at the occupancy maps
+        for snake in self.snakes:
+            for x, y in snake.occupied:
+                if 0 <= x < finder.width and 0 <= y < height:
+                    cell = x * height + y
+                    mark[cell] = stamp
+                    distance_to[cell] = -1
+
+        apple_id = finder.cell_id(apple)
+        mark[apple_id] = stamp
+        distance_to[apple_id] = 0
+        queue[0] = apple_id
+        head, tail = 0, 1
+
+        while head < tail:
+            current = queue[head]
+            head += 1
+            step = distance_to[current] + 1
+            for neighbor in neighbors[current]:
+                if mark[neighbor] != stamp:
+                    mark[neighbor] = stamp
+                    distance_to[neighbor] = step
+                    queue[tail] = neighbor
+                    tail += 1
+        finder.expanded += head
+
+    def distance(self, pos):
+        """Steps from a free cell to the apple, or None if it is cut off."""
+        finder = self.pathfinder
+        if not finder.in_bounds(pos):
+            return None
+        cell = finder.cell_id(pos)
+        if finder.mark[cell] != self.stamp or self.distance_to[cell] < 0:
+            return None
+        return self.distance_to[cell]
+
+    def moved_onto(self):
+        """Cells the snakes have moved onto since the field was built."""
+        cells = []
+        for snake, moves in zip(self.snakes, self.key[1:]):
+            for index in range(min(snake.moves - moves, len(snake.body))):
+                cells.append(snake.body[index])
+        return cells
+
+    def holds(self, pos):
+        """Whether distance(pos) (None: cut off) is still right on the live board.
+
+        Cells a snake has moved onto since the build can only lie on pos's
+        walks if they are closer to the apple, so when there are such cells
+        this walks down the field from pos around them. Cut off is trusted
+        only while nobody has moved, since a tail moving on may have opened
+        a way.
+        """
+        distance = self.distance(pos)
+        moved = self.moved_onto()
+        if distance is None:
+            return not moved
+        if pos in moved:
+            return False
+        closer = set()
+        for cell in moved:
+            blocked = self.distance(cell)
+            if blocked is not None and blocked < distance:
+                closer.add(cell)
+        while closer and distance > 0:
+            distance -= 1
+            x, y = pos
+            for step in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if step not in closer and self.distance(step) == distance:
+                    pos = step
+                    break
+            else:
+                return False
+        return True
+
+    def distance_from_head(self, head):
+        # A head sits on an occupied cell, so go through its best free neighbour
+        best = None
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            distance = self.distance((head[0] + dx, head[1] + dy))
+            if distance is not None and (best is None or distance < best):
+                best = distance
+        return None if best is None else best + 1
+
+    def next_step(self, head):
+        """Neighbour of head on a shortest walk to the apple, or None."""
+        best = best_pos = None
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            pos = (head[0] + dx, head[1] + dy)
+            distance = self.distance(pos)
+            if distance is not None and (best is None or distance < best):
+                best, best_pos = distance, pos
+        return best_pos
+
+
+class SpaceAnalysis:
+    """Connected regions of free cells, shared by the AIs within a tick.
+
+    area(pos) is the size of the region containing pos, which is what an
+    uncapped flood fill from pos would count. Each region is labelled by one
+    BFS the first time any of its cells is asked about; after that every
+    cell in it, such as the other candidate moves, is an O(1) lookup. Like
+    DistanceField, the labels are only thrown away once a snake has moved.
+    """
+
+    def __init__(self, snakes, width, height):
+        self.snakes = snakes
+        self.pathfinder = Pathfinder(width, height)
+        self.region = [0] * (width * height)
+        self.sizes = []
+        self.key = None
+        self.stamp = 0
+
+    def refresh(self):
+        key = tuple(snake.moves for snake in self.snakes)
+        if key == self.key:
+            return self
+        self.key = key
+
+        finder = self.pathfinder
+        self.stamp = stamp = finder.next_stamp()
+        self.sizes = []
+        mark, region, height = finder.mark, self.region, finder.height
+        # Bodies are pre-marked as belonging to no region
+        for snake in self.snakes:
+            for x, y in snake.occupied:
+                if 0 <= x < finder.width and 0 <= y < height:
+                    cell = x * height + y
+                    mark[cell] = stamp
+                    region[cell] = -1
+        return self
+
+    def is_labelled(self, pos):
+        finder = self.pathfinder
+        return (not finder.in_bounds(pos) or
+                finder.mark[finder.cell_id(pos)] == self.stamp)
+
+    def label_region(self, start):
+        finder = self.pathfinder
+        stamp = self.stamp
+        mark, queue, neighbors, region = finder.mark, finder.queue, finder.neighbors, self.region
+        label = len(self.sizes)
+        mark[start] = stamp
+        region[start] = label
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            current = queue[head]
+            head += 1
+            for neighbor in neighbors[current]:
+                if mark[neighbor] != stamp:
+                    mark[neighbor] = stamp
+                    region[neighbor] = label
+                    queue[tail] = neighbor
+                    tail += 1
+        finder.expanded += head
+        self.sizes.append(tail)
+
+    def area(self, pos):
+        """Free cells reachable from pos (0 if pos is off the board or taken)."""
+        finder = self.pathfinder
+        if not finder.in_bounds(pos):
+            return 0
+        cell = finder.cell_id(pos)
+        if finder.mark[cell] != self.stamp:
+            self.label_region(cell)
+        label = self.region[cell]
+        return self.sizes[label] if label >= 0 else 0
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from game.engine import GameEngine
+
+class BackgroundPlanner:
+    """Works out an AI's next move on a worker thread while the game renders.
+
+    The AI plays on a private copy of the game (the shadow engine). After
+    each tick the game calls plan(), which hands the worker a save_state()
+    snapshot; the worker loads it into the shadow and runs choose_move
+    there, so it never reads the live snakes while they change. At the
+    tick deadline move() returns the planned move if it is ready, for the
+    current tick and still safe, or else the live AI's fallback_move.
+
+    The plan is made before the player's move of the same tick is known,
+    so move() is called after the player has moved and checks the plan
+    against the live board: a planned step into the player's new head is
+    overruled.
+    """
+
+    def __init__(self, engine, make_ai, timer=None):
+        self.shadow = GameEngine(versus=engine.versus, target_apples=engine.target_apples,
+                                 power_ups_enabled=engine.power_ups_enabled,
+                                 board=engine.board, seed=engine.seed)
+        self.ai = make_ai(self.shadow)
+        self.timer = timer
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None
+        self.pending_tick = None
+        self.late = 0  # Ticks that had to use the fallback, plan not ready
+        self.overruled = 0  # Ticks whose plan was no longer safe
+
+    def plan(self, engine):
+        """Start on the move for the tick after engine's current state."""
+        if self.pending is not None and not self.pending.done():
+            return  # Still on an older tick; this one gets the fallback
+        self.pending_tick = engine.tick
+        self.pending = self.executor.submit(self.decide, engine.save_state())
+
+    def decide(self, state):
+        self.shadow.load_state(state)
+        if self.timer is None:
+            return self.ai.choose_move(self.shadow.apple)
+        return self.timer.decide(self.ai, 1, self.shadow.tick, self.shadow.apple)
+
+    def move(self, engine, live_ai):
+        # live_ai plays the real snake on engine
+        if (self.pending is None or self.pending_tick != engine.tick or
+                not self.pending.done()):
+            self.late += 1
+            return live_ai.fallback_move()
+        move = self.pending.result()
+        if not live_ai.is_move_safe(move):
+            self.overruled += 1
+            return live_ai.fallback_move()
+        return move
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
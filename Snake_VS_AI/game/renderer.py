@@ -0,0 +1,235 @@
+import pygame
+from collections import deque
+from game.constants import *
+
+# Drawing for the pygame front ends. Nothing in here changes game state.
+
+# Fonts are loaded once and rendered text is kept, keyed on (text, size,
+# color), so static labels and unchanged scores are not re-rendered every
+# frame. The label cache is simply emptied if it ever grows past MAX_LABELS.
+MAX_LABELS = 256
+_fonts = {}
+_labels = {}
+
+def font(size):
+    if size not in _fonts:
+        _fonts[size] = pygame.font.Font(None, size)
+    return _fonts[size]
+
+def label(text, size, color):
+    key = (text, size, color)
+    surface = _labels.get(key)
+    if surface is None:
+        if len(_labels) >= MAX_LABELS:
+            _labels.clear()
+        surface = _labels[key] = font(size).render(text, True, color)
+    return surface
+
+def draw_walls(screen, wall_color):
+    wall_thickness = GRID_SIZE * 2
+    pygame.draw.rect(screen, wall_color, (0, 0, WINDOW_WIDTH, wall_thickness))
+    pygame.draw.rect(screen, wall_color, (0, WINDOW_HEIGHT - wall_thickness, WINDOW_WIDTH, wall_thickness))
+    pygame.draw.rect(screen, wall_color, (0, 0, wall_thickness, WINDOW_HEIGHT))
+    pygame.draw.rect(screen, wall_color, (WINDOW_WIDTH - wall_thickness, 0, wall_thickness, WINDOW_HEIGHT))
+
+def draw_apple(screen, apple):
+    pygame.draw.rect(screen, RED,
+                     (apple[0] * GRID_SIZE,
+                      apple[1] * GRID_SIZE,
+                      GRID_SIZE - 2,
+                      GRID_SIZE - 2))
+
+def draw_snake(screen, snake):
+    # Draw body
+    for segment in snake.body:
+        draw_segment(screen, snake.color, segment)
+    draw_face(screen, snake.body[0], snake.direction)
+
+def draw_segment(screen, color, segment):
+    pygame.draw.rect(screen, color,
+                   (segment[0] * GRID_SIZE,
+                    segment[1] * GRID_SIZE,
+                    GRID_SIZE - 2,
+                    GRID_SIZE - 2))
+
+def draw_face(screen, head, direction):
+    head_x = head[0] * GRID_SIZE
+    head_y = head[1] * GRID_SIZE
+
+    # Draw eyes
+    eye_color = (0, 0, 0)  # Black eyes
+    eye_radius = GRID_SIZE // 6
+
+    # Adjust eye positions based on direction
+    if direction == RIGHT:
+        eye_pos = [(head_x + 3*GRID_SIZE//4, head_y + GRID_SIZE//3),
+                  (head_x + 3*GRID_SIZE//4, head_y + 2*GRID_SIZE//3)]
+    elif direction == LEFT:
+        eye_pos = [(head_x + GRID_SIZE//4, head_y + GRID_SIZE//3),
+                  (head_x + GRID_SIZE//4, head_y + 2*GRID_SIZE//3)]
+    elif direction == UP:
+        eye_pos = [(head_x + GRID_SIZE//3, head_y + GRID_SIZE//4),
+                  (head_x + 2*GRID_SIZE//3, head_y + GRID_SIZE//4)]
+    else:  # DOWN
+        eye_pos = [(head_x + GRID_SIZE//3, head_y + 3*GRID_SIZE//4),
+                  (head_x + 2*GRID_SIZE//3, head_y + 3*GRID_SIZE//4)]
+
+    for pos in eye_pos:
+        pygame.draw.circle(screen, eye_color, pos, eye_radius)
+
+def draw_power_up(screen, power_up):
+    if not power_up.position:
+        return
+
+    x, y = power_up.position
+    center = (x * GRID_SIZE + GRID_SIZE//2, y * GRID_SIZE + GRID_SIZE//2)
+    radius = GRID_SIZE//2 - 2
+
+    # Draw freeze power-up (blue circle with 'F')
+    color = (0, 191, 255)  # Deep Sky Blue
+    pygame.draw.circle(screen, color, center, radius)
+
+    # Draw text
+    text_surface = label('F', 20, WHITE)
+    text_rect = text_surface.get_rect(center=center)
+    screen.blit(text_surface, text_rect)
+
+
+class BoardRenderer:
+    """Draws a game incrementally instead of repainting the whole window.
+
+    The background and walls are drawn once into a cached surface. Each
+    frame only the cells that changed since the last one are repainted
+    (new head cells, the old head, cells the tail left, the old and new
+    apple, power-ups that came or went) and only those rectangles are sent
+    to display.update, so the cost of a frame does not grow with the
+    snakes' length. Overlays (score, messages) are cached labels blitted
+    on top; when one goes away, the cells under it are repainted.
+
+    A copy of each drawn body is kept so the vacated tail cells are known.
+    Anything the incremental path cannot follow (another engine or set of
+    snakes, more moves than a snake is long, a replay seek backwards)
+    falls back to a full redraw; invalidate() forces one.
+    """
+
+    def __init__(self, screen, background_color, wall_color):
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(background_color)
+        draw_walls(self.background, wall_color)
+        self.invalidate()
+
+    def invalidate(self):
+        self.engine = None
+
+    def cell_rect(self, cell):
+        return pygame.Rect(cell[0] * GRID_SIZE, cell[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+
+    def cells_under(self, rect):
+        for x in range(rect.left // GRID_SIZE, (rect.right - 1) // GRID_SIZE + 1):
+            for y in range(rect.top // GRID_SIZE, (rect.bottom - 1) // GRID_SIZE + 1):
+                yield (x, y)
+
+    def draw_cell(self, cell):
+        # Repaint one cell from the current state, in the same order as a full draw
+        rect = self.cell_rect(cell)
+        self.screen.blit(self.background, rect, rect)
+        for snake in self.snakes:
+            if snake.occupies(cell):
+                draw_segment(self.screen, snake.color, cell)
+                if cell == snake.body[0]:
+                    draw_face(self.screen, cell, snake.direction)
+        if cell == self.apple:
+            draw_apple(self.screen, cell)
+        for power_up in self.power_ups:
+            if power_up.position == cell:
+                draw_power_up(self.screen, power_up)
+        return rect
+
+    def draw(self, engine, snakes, overlays=(), show_items=True):
+        """Bring the screen up to date with the given snakes of engine.
+
+        overlays are (surface, rect) pairs drawn on top; show_items=False
+        leaves out the apple and power-ups.
+        """
+        self.snakes = snakes
+        self.apple = engine.apple if show_items else None
+        self.power_ups = engine.power_ups if show_items else []
+        power_ups = {power_up.position for power_up in self.power_ups}
+        overlays = list(overlays)
+
+        if self.incremental(engine, snakes):
+            dirty = set()
+            for snake, body in zip(snakes, self.bodies):
+                moved = snake.moves - body.moves
+                if moved or snake.direction != body.direction:
+                    dirty.add(body[0])  # Old head loses its face
+                for cell in reversed([snake.body[i] for i in range(moved)]):
+                    body.appendleft(cell)
+                    dirty.add(cell)
+                while len(body) > len(snake.body):
+                    dirty.add(body.pop())
+                body.moves, body.direction = snake.moves, snake.direction
+            if self.apple != self.drawn_apple:
+                dirty.update(cell for cell in (self.apple, self.drawn_apple) if cell is not None)
+            dirty.update(power_ups ^ self.drawn_power_ups)
+
+            rects = [self.draw_cell(cell) for cell in dirty]
+            # Text is alpha-blended, so an overlay is only ever drawn onto
+            # freshly repainted cells: repaint the area of every overlay that
+            # went away, is new, or overlaps something repainted, then draw
+            # the current overlays there again
+            stale = [rect for surface, rect in self.drawn_overlays if (surface, rect) not in overlays]
+            stale += [rect for surface, rect in overlays if (surface, rect) not in self.drawn_overlays]
+            pending = [rect for _, rect in overlays if rect not in stale]
+            while True:
+                overlapping = [rect for rect in pending
+                               if rect.collidelist(rects) != -1 or rect.collidelist(stale) != -1]
+                if not overlapping:
+                    break
+                stale += overlapping
+                pending = [rect for rect in pending if rect not in overlapping]
+            for rect in stale:
+                for cell in self.cells_under(rect):
+                    self.draw_cell(cell)
+            rects += stale
+            for surface, rect in overlays:
+                if rect in stale:
+                    self.screen.blit(surface, rect)
+            if rects:
+                pygame.display.update(rects)
+        else:
+            self.screen.blit(self.background, (0, 0))
+            for snake in snakes:
+                draw_snake(self.screen, snake)
+            if self.apple is not None:
+                draw_apple(self.screen, self.apple)
+            for power_up in self.power_ups:
+                draw_power_up(self.screen, power_up)
+            for surface, rect in overlays:
+                self.screen.blit(surface, rect)
+            pygame.display.flip()
+            self.engine = engine
+            self.bodies = [DrawnBody(snake) for snake in snakes]
+
+        self.drawn_apple = self.apple
+        self.drawn_power_ups = power_ups
+        self.drawn_overlays = overlays
+
+    def incremental(self, engine, snakes):
+        if engine is not self.engine or len(snakes) != len(self.bodies):
+            return False
+        for snake, body in zip(snakes, self.bodies):
+            if body.snake is not snake or not 0 <= snake.moves - body.moves <= len(snake.body):
+                return False
+        return True
+
+
+class DrawnBody(deque):
+    """The cells of a snake as last drawn, head first."""
+
+    def __init__(self, snake):
+        super().__init__(snake.body)
+        self.snake = snake
+        self.moves = snake.moves
+        self.direction = snake.direction
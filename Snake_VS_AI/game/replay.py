@@ -0,0 +1,186 @@
+import struct
+from game.constants import *
+from game.config import BoardConfig
+
+# Binary replay archives.
+#
+# A file is MAGIC followed by any number of games. A game is GAME_HEADER
+# (seed, board size, target apples, flags), then one move byte per snake
+# per tick, then END_OF_GAME and the winner. The seed regenerates every
+# apple and power-up, so the moves are all that is needed to play a game
+# back exactly, without the AIs that made them.
+#
+# A move byte is the index of the direction the snake moved in (same order
+# as SnakeAI's [UP, DOWN, LEFT, RIGHT]) with MOVED set, or 0 if it did not
+# move that tick (frozen, or no second snake).
+
+# Bumped whenever spawning changes, since older games would no longer replay
+MAGIC = b'SNKRPLY2'
+GAME_HEADER = struct.Struct('<QHHHB')
+END_OF_GAME = 0xFF
+NO_WINNER = 2
+MOVED = 0x04
+VERSUS = 0x01
+POWER_UPS = 0x02
+
+# ReplayPlayer saves the whole engine state this often (in ticks)
+KEYFRAME_INTERVAL = 50
+
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+def pack_move(direction):
+    return DIRECTION_CODES[direction] | MOVED
+
+def unpack_move(byte):
+    return DIRECTIONS[byte & 3] if byte & MOVED else None
+
+
+class ReplayRecorder:
+    """Records games played by a GameEngine into a binary file object.
+
+    The engine calls start_game, record_tick and end_game itself once it
+    is given the recorder. Each game is buffered and written out in one
+    piece when it ends, so games abandoned halfway never reach the file.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.game = None
+
+    @classmethod
+    def create(cls, path, append=False):
+        # append=True adds games to an existing archive (or starts a new one)
+        file = open(path, 'ab' if append else 'wb')
+        if file.tell() == 0:
+            file.write(MAGIC)
+        return cls(file)
+
+    def start_game(self, engine):
+        flags = (VERSUS if engine.versus else 0) | (POWER_UPS if engine.power_ups_enabled else 0)
+        self.game = bytearray(GAME_HEADER.pack(engine.seed, engine.board.width, engine.board.height,
+                                               engine.target_apples, flags))
+
+    def record_tick(self, moves):
+        self.game += moves
+
+    def end_game(self, engine):
+        self.game.append(END_OF_GAME)
+        self.game.append(NO_WINNER if engine.winner is None else engine.winner)
+        self.write_game(self.game)
+        self.game = None
+
+    def write_game(self, data):
+        # Also used to copy games recorded elsewhere (e.g. by worker processes)
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class Replay:
+    """One recorded game: its settings and the packed move bytes."""
+
+    def __init__(self, seed, board, target_apples, flags, moves, winner):
+        self.seed = seed
+        self.board = board
+        self.target_apples = target_apples
+        self.versus = bool(flags & VERSUS)
+        self.power_ups_enabled = bool(flags & POWER_UPS)
+        self.moves = moves
+        self.winner = None if winner == NO_WINNER else winner
+
+    @property
+    def ticks(self):
+        return len(self.moves) // 2
+
+    def tick_moves(self, tick):
+        """Directions both snakes moved in on a tick (None if one did not move)."""
+        return unpack_move(self.moves[2 * tick]), unpack_move(self.moves[2 * tick + 1])
+
+    def new_engine(self):
+        """A GameEngine in this game's starting position."""
+        from game.engine import GameEngine
+        return GameEngine(versus=self.versus, target_apples=self.target_apples,
+                          power_ups_enabled=self.power_ups_enabled, board=self.board,
+                          seed=self.seed)
+
+    def play_tick(self, engine):
+        # Apply the recorded moves of tick engine.tick. They are the
+        # directions the snakes actually took, so they are set directly
+        # instead of going through change_direction's reversal check.
+        moves, base = self.moves, 2 * engine.tick
+        for index, snake in enumerate(engine.snakes):
+            byte = moves[base + index]
+            if byte & MOVED:
+                snake.direction = DIRECTIONS[byte & 3]
+                snake.move()
+        engine.update()
+
+    def simulate(self):
+        """Play the whole game back on a fresh engine and return the engine."""
+        engine = self.new_engine()
+        for _ in range(self.ticks):
+            self.play_tick(engine)
+        return engine
+
+
+class ReplayPlayer:
+    """Random access to the ticks of a Replay, without rendering.
+
+    While playing forward, the engine state is saved every
+    `keyframe_interval` ticks. seek(tick) restores the last keyframe at or
+    before the tick and re-simulates only the moves after it, so jumping
+    around a game that has been played through once costs at most one
+    interval of ticks.
+    """
+
+    def __init__(self, replay, keyframe_interval=KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.engine = replay.new_engine()
+        self.keyframes = [self.engine.save_state()]  # keyframes[i] is tick i * interval
+
+    @property
+    def tick(self):
+        return self.engine.tick
+
+    def step(self):
+        """Play one tick forward; False at the end of the game."""
+        if self.engine.tick >= self.replay.ticks:
+            return False
+        self.replay.play_tick(self.engine)
+        if (self.engine.tick % self.keyframe_interval == 0 and
+                self.engine.tick // self.keyframe_interval == len(self.keyframes)):
+            self.keyframes.append(self.engine.save_state())
+        return True
+
+    def seek(self, tick):
+        """Move to the state after `tick` ticks (clamped to the game) and return the engine."""
+        tick = max(0, min(tick, self.replay.ticks))
+        keyframe = min(tick // self.keyframe_interval, len(self.keyframes) - 1)
+        keyframe_tick = keyframe * self.keyframe_interval
+        # Going back, or a keyframe is closer than where we are
+        if tick < self.engine.tick or keyframe_tick > self.engine.tick:
+            self.engine.load_state(self.keyframes[keyframe])
+        while self.engine.tick < tick:
+            self.step()
+        return self.engine
+
+
+def parse_replays(data):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a replay file")
+    pos = len(MAGIC)
+    while pos < len(data):
+        seed, width, height, target_apples, flags = GAME_HEADER.unpack_from(data, pos)
+        pos += GAME_HEADER.size
+        end = data.index(END_OF_GAME, pos)
+        yield Replay(seed, BoardConfig(width, height), target_apples, flags,
+                     data[pos:end], data[end + 1])
+        pos = end + 2
+
+def load_replays(path):
+    with open(path, 'rb') as f:
+        return list(parse_replays(f.read()))
@@ -0,0 +1,75 @@
+import json
+from collections import Counter
+
+# Append-only tournament results: one JSON object per line, one line per
+# finished game, e.g.
+#
+#   {"seed": 17, "ai1": "SnakeAI", "ai2": "PathfindingStrategicAI",
+#    "board": "40x30", "winner": "AI1", "ticks": 212, "scores": [10, 7],
+#    "seconds": 0.41}
+#
+# Lines are flushed as games finish, so a run that dies loses at most the
+# line being written, and readers go through the file a line at a time.
+
+class ResultsLog:
+    def __init__(self, path):
+        self.drop_partial_line(path)
+        self.file = open(path, 'a')
+
+    @staticmethod
+    def drop_partial_line(path):
+        # A line cut off by a run that died would run into the next record
+        try:
+            f = open(path, 'rb+')
+        except FileNotFoundError:
+            return
+        with f:
+            end = pos = f.seek(0, 2)
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                newline = f.read(step).rfind(b'\n')
+                if newline != -1:
+                    pos += newline + 1
+                    break
+            if pos != end:
+                f.truncate(pos)
+
+    def write(self, result):
+        self.file.write(json.dumps(result, separators=(',', ':')) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_results(path):
+    """Yield the records in a results file one at a time.
+
+    A cut-off last line (the process died while writing it) is skipped.
+    """
+    try:
+        f = open(path)
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            yield json.loads(line)
+
+def match_up(ai1, ai2, board):
+    return ai1, ai2, f"{board.width}x{board.height}"
+
+def completed_games(path, ai1, ai2, board):
+    """Records already in the file for this match-up, by seed."""
+    key = match_up(ai1, ai2, board)
+    return {r['seed']: r for r in read_results(path) if (r['ai1'], r['ai2'], r['board']) == key}
+
+def tally(path):
+    """Winner counts per (ai1, ai2, board) match-up, streamed from the file."""
+    counts = {}
+    for r in read_results(path):
+        counts.setdefault((r['ai1'], r['ai2'], r['board']), Counter())[r['winner']] += 1
+    return counts
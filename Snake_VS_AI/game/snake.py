@@ -1,20 +1,38 @@
-import pygame
+from collections import deque
 from game.constants import *
+from game.config import DEFAULT_BOARD
 
 class Snake:
-    def __init__(self, x, y, color):
-        self.body = [(x, y)]
+    def __init__(self, x, y, color, board=DEFAULT_BOARD):
+        self.board = board
+        # Head at the left end, tail at the right end
+        self.body = deque([(x, y)])
+        # Cell -> number of body segments on it, kept in step with body
+        self.occupied = {(x, y): 1}
         self.direction = RIGHT
         self.color = color
         self.growing = False
         self.score = 0
+        self.moves = 0  # Bumped on every move, so caches can tell the body changed
+        self.free_cells = None  # The game's FreeCells, told about every cell entered or left
 
     def move(self):
         head = self.body[0]
         new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-        self.body.insert(0, new_head)
+        self.moves += 1
+        self.body.appendleft(new_head)
+        count = self.occupied.get(new_head, 0) + 1
+        self.occupied[new_head] = count
+        if count == 1 and self.free_cells is not None:
+            self.free_cells.take(new_head)
         if not self.growing:
-            self.body.pop()
+            tail = self.body.pop()
+            if self.occupied[tail] == 1:
+                del self.occupied[tail]
+                if self.free_cells is not None:
+                    self.free_cells.release(tail)
+            else:
+                self.occupied[tail] -= 1
         else:
             self.growing = False
 
@@ -23,6 +41,19 @@ class Snake:
         if (new_direction[0] * -1, new_direction[1] * -1) != self.direction:
             self.direction = new_direction
 
+    def save_state(self):
+        return (tuple(self.body), self.direction, self.growing, self.score, self.moves)
+
+    def load_state(self, state):
+        body, self.direction, self.growing, self.score, self.moves = state
+        self.body = deque(body)
+        self.occupied = {}
+        for cell in body:
+            self.occupied[cell] = self.occupied.get(cell, 0) + 1
+
+    def occupies(self, pos):
+        return pos in self.occupied
+
     def grow(self):
         self.growing = True
         self.score += 1
@@ -31,52 +62,16 @@ class Snake:
         head = self.body[0]
 
         # Wall collision
-        if (head[0] < 0 or head[0] >= GRID_WIDTH or 
-            head[1] < 0 or head[1] >= GRID_HEIGHT):
+        if not (0 <= head[0] < self.board.width and 0 <= head[1] < self.board.height):
             return True
 
-        # Self collision
-        if head in self.body[1:]:
+        # Self collision (head shares its cell with another segment)
+        if self.occupied[head] > 1:
             return True
 
         # Other snake collision
         if other_snake:
-            if head in other_snake.body:
+            if other_snake.occupies(head):
                 return True
 
         return False
-
-    def draw(self, screen):
-        # Draw body
-        for segment in self.body:
-            pygame.draw.rect(screen, self.color,
-                           (segment[0] * GRID_SIZE,
-                            segment[1] * GRID_SIZE,
-                            GRID_SIZE - 2,
-                            GRID_SIZE - 2))
-
-        # Draw face on head
-        head = self.body[0]
-        head_x = head[0] * GRID_SIZE
-        head_y = head[1] * GRID_SIZE
-
-        # Draw eyes
-        eye_color = (0, 0, 0)  # Black eyes
-        eye_radius = GRID_SIZE // 6
-
-        # Adjust eye positions based on direction
-        if self.direction == RIGHT:
-            eye_pos = [(head_x + 3*GRID_SIZE//4, head_y + GRID_SIZE//3),
-                      (head_x + 3*GRID_SIZE//4, head_y + 2*GRID_SIZE//3)]
-        elif self.direction == LEFT:
-            eye_pos = [(head_x + GRID_SIZE//4, head_y + GRID_SIZE//3),
-                      (head_x + GRID_SIZE//4, head_y + 2*GRID_SIZE//3)]
-        elif self.direction == UP:
-            eye_pos = [(head_x + GRID_SIZE//3, head_y + GRID_SIZE//4),
-                      (head_x + 2*GRID_SIZE//3, head_y + GRID_SIZE//4)]
-        else:  # DOWN
-            eye_pos = [(head_x + GRID_SIZE//3, head_y + 3*GRID_SIZE//4),
-                      (head_x + 2*GRID_SIZE//3, head_y + 3*GRID_SIZE//4)]
-
-        for pos in eye_pos:
-            pygame.draw.circle(screen, eye_color, pos, eye_radius)
\ No newline at end of file
@@ -0,0 +1,28 @@
+class FixedTimestep:
+    """Turns real elapsed time into a number of fixed-length steps.
+
+    Game.run feeds it the milliseconds each frame took and runs as many
+    game ticks as are due, so the game speed follows the clock rather than
+    the frame rate. If a frame is so slow that more than max_steps are due,
+    the backlog is dropped instead of being caught up in one burst.
+    """
+
+    def __init__(self, rate, max_steps=5):
+        self.interval = 1000 / rate
+        self.max_steps = max_steps
+        self.accumulated = 0.0
+
+    def set_rate(self, rate):
+        self.interval = 1000 / rate
+
+    def reset(self):
+        self.accumulated = 0.0
+
+    def advance(self, elapsed_ms):
+        self.accumulated += elapsed_ms
+        steps = int(self.accumulated // self.interval)
+        if steps > self.max_steps:
+            self.accumulated = 0.0
+            return self.max_steps
+        self.accumulated -= steps * self.interval
+        return steps
@@ -1,75 +1,80 @@
+import argparse
 import pygame
-import random
 from game.constants import *
-from game.snake import Snake
+from game.engine import GameEngine
 from game.ai import SnakeAI
 from game.menu import Menu
-from game.powerup import PowerUp, PowerUpEffect
+from game.metrics import DecisionTimer
+from game.planner import BackgroundPlanner
+from game.replay import ReplayPlayer, load_replays
+from game.timestep import FixedTimestep
+from game import renderer
 #if you want to play vs other algorithems:
 from game.AI_Compeditors.CycleSafeAStarAI import CycleSafeAStarAI
 from game.AI_Compeditors.PathfindingStrategicAI import PathfindingStrategicAI
 from game.AI_Compeditors.SmartSurvivorAI import SmartSurvivorAI
 from game.AI_Compeditors.UltimateHybridAI import UltimateHybridAI
+from game.AI_Compeditors.HamiltonianAI import HamiltonianAI
 
 class Game:
-    def __init__(self):
+    def __init__(self, instrument=False):
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Snake Game")
         self.clock = pygame.time.Clock()
         self.menu = Menu()
-        self.frame_count = 0
+        # instrument=True prints the AI's decision latency when each game ends
+        self.instrument = instrument
+        self.planner = None
         self.reset_game()
 
-    def reset_game(self):
+    def reset_game(self, vs_ai=True, target_apples=10):
         colors = self.menu.get_current_colors()
-        self.player = Snake(GRID_WIDTH // 4, GRID_HEIGHT // 2, colors['player'])
-        self.ai_snake = Snake(3 * GRID_WIDTH // 4, GRID_HEIGHT // 2, colors['ai'])
-        #CHOOSE ALGORITHEM HERE
-
-        self.ai = SnakeAI(self.ai_snake, self.player, self.menu.difficulty_options[self.menu.current_difficulty])
-        #self.ai = UltimateHybridAI(self.ai_snake, self.player)
-        #self.ai = SmartSurvivorAI(self.ai_snake, self.player)
-        #self.ai = PathfindingStrategicAI(self.ai_snake, self.player)
-        #self.ai = CycleSafeAStarAI(self.ai_snake, self.player)
-
+        self.engine = GameEngine(versus=vs_ai, target_apples=target_apples,
+                                 power_ups_enabled=self.menu.special_abilities_enabled,
+                                 colors=(colors['player'], colors['ai']))
+        self.player, self.ai_snake = self.engine.snakes
+        # Plays the live snake only when the planner's move is not ready in time
+        self.ai = self.make_ai(self.engine)
+        self.timer = DecisionTimer() if self.instrument else None
+
+        if self.planner is not None:
+            self.planner.close()
+        self.planner = None
+        if vs_ai:
+            # The AI thinks on a worker thread, from a snapshot of each tick
+            self.planner = BackgroundPlanner(self.engine, self.make_ai, self.timer)
+            tick_ms = 1000 / (self.get_snake_speed() or 1)
+            self.planner.ai.set_budget(ms=tick_ms * AI_MOVE_BUDGET_SHARE)
+        self.board_renderer = renderer.BoardRenderer(self.screen, colors['background'], colors['wall'])
+        # Game ticks follow the clock, not the frame rate; power-up effects
+        # count down in frames of FPS
+        self.tick_steps = FixedTimestep(self.get_snake_speed() or 1)
+        self.effect_steps = FixedTimestep(FPS, max_steps=FPS)
 
-
-        self.apple = self.spawn_apple()
-        self.game_over = False
-        self.winner = None
         self.game_started = False
-        self.power_ups = []
-        self.player_effects = []
-        self.ai_effects = []
-        if self.menu.special_abilities_enabled:
-            self.spawn_power_up()
 
-    def spawn_apple(self):
-        while True:
-            apple = (random.randint(2, GRID_WIDTH-3), 
-                    random.randint(2, GRID_HEIGHT-3))
-            if (apple not in self.player.body and 
-                (not hasattr(self, 'ai_snake') or apple not in self.ai_snake.body)):
-                return apple
-
-    def spawn_power_up(self):
-        if len(self.power_ups) < 2:  # Maximum 2 power-ups at a time
-            new_power_up = PowerUp()  # Now PowerUp only creates freeze power-ups
-            while (new_power_up.position in self.player.body or 
-                   new_power_up.position in self.ai_snake.body or 
-                   new_power_up.position == self.apple):
-                new_power_up.spawn()
-            self.power_ups.append(new_power_up)
+    def make_ai(self, engine):
+        player, ai_snake = engine.snakes
+        #CHOOSE ALGORITHEM HERE
+
+        ai = SnakeAI(ai_snake, player, self.menu.difficulty_options[self.menu.current_difficulty])
+        #ai = UltimateHybridAI(ai_snake, player)
+        #ai = SmartSurvivorAI(ai_snake, player)
+        #ai = PathfindingStrategicAI(ai_snake, player)
+        #ai = CycleSafeAStarAI(ai_snake, player)
+        #ai = HamiltonianAI(ai_snake, player)
+        ai.distance_field = engine.distance_field
+        ai.space_analysis = engine.space_analysis
+        return ai
 
     def get_snake_speed(self):
         base_speeds = [3, 5, 8]  # Slow, Normal, Fast
         base_speed = base_speeds[self.menu.current_speed]
 
         # Only check for freeze effect
-        for effect in self.player_effects:
-            if effect.remaining > 0:  # If frozen
-                base_speed = 0
+        if self.engine.is_frozen(0):
+            base_speed = 0
 
         return int(base_speed)
 
@@ -78,23 +83,90 @@ class Game:
         base_speed = base_speeds[self.menu.current_speed]
 
         # Only check for freeze effect
-        for effect in self.ai_effects:
-            if effect.remaining > 0:  # If frozen
-                base_speed = 0
+        if self.engine.is_frozen(1):
+            base_speed = 0
 
         return int(base_speed)
 
-    def update_effects(self):
-        self.player_effects = [effect for effect in self.player_effects if effect.update()]
-        self.ai_effects = [effect for effect in self.ai_effects if effect.update()]
+    def watch_replay(self, replay, start_tick=0):
+        """Step through a recorded game, e.g. to look at one AI decision.
+
+        LEFT/RIGHT step one tick, DOWN/UP ten, PAGE DOWN/PAGE UP fifty,
+        HOME/END jump to the start or end, SPACE plays or pauses, ESC quits.
+        """
+        if not replay.board.is_default():
+            raise ValueError("only games on the default board can be drawn")
+        player = ReplayPlayer(replay)
+        player.seek(start_tick)
+        steps = {pygame.K_RIGHT: 1, pygame.K_LEFT: -1, pygame.K_UP: 10, pygame.K_DOWN: -10,
+                 pygame.K_PAGEUP: 50, pygame.K_PAGEDOWN: -50}
+        names = {UP: "UP", DOWN: "DOWN", LEFT: "LEFT", RIGHT: "RIGHT", None: "-"}
+        font = renderer.font(28)
+        info = info_surface = None
+        board_renderer = renderer.BoardRenderer(self.screen, BLACK,
+                                                self.menu.get_current_colors()['wall'])
+        play_steps = FixedTimestep(10)  # 10 ticks a second
+        playing = False
+        elapsed = 0
 
-    def draw_walls(self):
-        wall_color = self.menu.get_current_colors()['wall']
-        wall_thickness = GRID_SIZE * 2
-        pygame.draw.rect(self.screen, wall_color, (0, 0, WINDOW_WIDTH, wall_thickness))
-        pygame.draw.rect(self.screen, wall_color, (0, WINDOW_HEIGHT - wall_thickness, WINDOW_WIDTH, wall_thickness))
-        pygame.draw.rect(self.screen, wall_color, (0, 0, wall_thickness, WINDOW_HEIGHT))
-        pygame.draw.rect(self.screen, wall_color, (WINDOW_WIDTH - wall_thickness, 0, wall_thickness, WINDOW_HEIGHT))
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        pygame.quit()
+                        return
+                    elif event.key in steps:
+                        player.seek(player.tick + steps[event.key])
+                    elif event.key == pygame.K_HOME:
+                        player.seek(0)
+                    elif event.key == pygame.K_END:
+                        player.seek(replay.ticks)
+                    elif event.key == pygame.K_SPACE:
+                        playing = not playing
+                        play_steps.reset()
+
+            if playing:
+                for _ in range(play_steps.advance(elapsed)):
+                    playing = player.step()
+                    if not playing:
+                        break
+
+            engine = player.engine
+
+            # The moves the snakes made from the position on screen
+            if player.tick < replay.ticks:
+                move1, move2 = replay.tick_moves(player.tick)
+                next_moves = f"next: {names[move1]} / {names[move2]}"
+            else:
+                next_moves = f"winner: {'-' if replay.winner is None else replay.winner + 1}"
+            scores = " - ".join(str(snake.score) for snake in engine.snakes)
+            text = f"Tick {player.tick} / {replay.ticks}   score {scores}   {next_moves}"
+            if text != info:  # Changes every tick, so kept here rather than as a label
+                info, info_surface = text, font.render(text, True, WHITE)
+            board_renderer.draw(engine, engine.snakes[:2 if replay.versus else 1],
+                                [(info_surface, info_surface.get_rect(topleft=(10, 10)))])
+            elapsed = self.clock.tick(FPS)
+
+    def game_tick(self, vs_ai):
+        self.engine.move(0)
+
+        if vs_ai:
+            ai_speed = self.get_ai_speed()
+            if ai_speed > 0:
+                # After the player's move, so the plan is checked against it
+                self.engine.move(1, self.planner.move(self.engine, self.ai))
+
+        if self.engine.update():
+            if self.timer is not None:
+                print(self.timer.report(1, type(self.ai).__name__))
+                print(self.timer.shared_report())
+                if vs_ai:
+                    print(f"{self.planner.late} plans late, {self.planner.overruled} overruled")
+        elif vs_ai:
+            self.planner.plan(self.engine)
 
     def run(self):
         state = "menu"
@@ -102,6 +174,7 @@ class Game:
         target_apples = 10
         vs_ai = False
         color_selection_item = 0
+        elapsed = 0
 
         while True:
             for event in pygame.event.get():
@@ -182,14 +255,18 @@ class Game:
                         elif event.key == pygame.K_DOWN:
                             target_apples = max(target_apples - 1, 1)
                         elif event.key == pygame.K_RETURN:
-                            self.reset_game()
+                            self.reset_game(vs_ai, target_apples)
                             state = "game"
 
                 elif state == "game":
                     if event.type == pygame.KEYDOWN:
                         if not self.game_started and event.key == pygame.K_RETURN:
                             self.game_started = True
-                        elif not self.game_over and self.game_started:
+                            if self.planner is not None:
+                                self.planner.plan(self.engine)
+                            self.tick_steps.reset()
+                            self.effect_steps.reset()
+                        elif not self.engine.game_over and self.game_started:
                             if event.key == pygame.K_UP:
                                 self.player.change_direction(UP)
                             elif event.key == pygame.K_DOWN:
@@ -223,105 +300,62 @@ class Game:
             elif state == "select_apples":
                 self.menu.draw_win_condition_selector(self.screen, target_apples)
             elif state == "game":
-                self.screen.fill(self.menu.get_current_colors()['background'])
-                self.draw_walls()
-
+                # Draws only what changed and updates the display itself
                 if not self.game_started:
-                    start_text = pygame.font.Font(None, 48).render("Press Enter to Start", True, WHITE)
+                    start_text = renderer.label("Press Enter to Start", 48, WHITE)
                     text_rect = start_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-                    self.screen.blit(start_text, text_rect)
+                    self.board_renderer.draw(self.engine, [], [(start_text, text_rect)], show_items=False)
                 else:
-                    if not self.game_over:
-                        self.frame_count += 1
-                        self.update_effects()
+                    if not self.engine.game_over:
+                        for _ in range(self.effect_steps.advance(elapsed)):
+                            self.engine.update_effects()
 
+                        # Run every tick that is due; frames without one redraw nothing
                         snake_speed = self.get_snake_speed()
-                        if snake_speed > 0 and self.frame_count >= FPS // snake_speed:
-                            self.player.move()
-
-                            if vs_ai:
-                                ai_speed = self.get_ai_speed()
-                                if ai_speed > 0:
-                                    ai_direction = self.ai.get_next_move(self.apple)
-                                    self.ai_snake.change_direction(ai_direction)
-                                    self.ai_snake.move()
-
-                            self.frame_count = 0
-
-                        if self.player.check_collision(self.ai_snake if vs_ai else None):
-                            self.game_over = True
-                            self.winner = "AI" if vs_ai else None
-                        elif vs_ai and self.ai_snake.check_collision(self.player):
-                            self.game_over = True
-                            self.winner = "Player"
-
-                        if self.player.body[0] == self.apple:
-                            self.player.grow()
-                            self.apple = self.spawn_apple()
-                            if self.menu.special_abilities_enabled:
-                                if random.random() < 0.3:  # 30% chance to spawn power-up
-                                    self.spawn_power_up()
-                        elif vs_ai and self.ai_snake.body[0] == self.apple:
-                            self.ai_snake.grow()
-                            self.apple = self.spawn_apple()
-                            if self.menu.special_abilities_enabled:
-                                if random.random() < 0.3:  # 30% chance to spawn power-up
-                                    self.spawn_power_up()
-
-                        # Check power-up collection
-                        if self.menu.special_abilities_enabled:
-                            for power_up in self.power_ups[:]:
-                                if self.player.body[0] == power_up.position:
-                                    # Player gets power-up, freeze AI
-                                    self.ai_effects.append(PowerUpEffect())
-                                    self.power_ups.remove(power_up)
-                                elif vs_ai and self.ai_snake.body[0] == power_up.position:
-                                    # AI gets power-up, freeze player
-                                    self.player_effects.append(PowerUpEffect())
-                                    self.power_ups.remove(power_up)
-
-                        if self.player.score >= target_apples:
-                            self.game_over = True
-                            self.winner = "Player"
-                        elif vs_ai and self.ai_snake.score >= target_apples:
-                            self.game_over = True
-                            self.winner = "AI"
-
-                    self.player.draw(self.screen)
-                    if vs_ai:
-                        self.ai_snake.draw(self.screen)
-                    pygame.draw.rect(self.screen, RED,
-                                   (self.apple[0] * GRID_SIZE,
-                                    self.apple[1] * GRID_SIZE,
-                                    GRID_SIZE - 2,
-                                    GRID_SIZE - 2))
-
-                    if self.menu.special_abilities_enabled:
-                        for power_up in self.power_ups:
-                            power_up.draw(self.screen)
+                        if snake_speed > 0:
+                            self.tick_steps.set_rate(snake_speed)
+                            for _ in range(self.tick_steps.advance(elapsed)):
+                                self.game_tick(vs_ai)
+                                if self.engine.game_over:
+                                    break
+                        else:
+                            self.tick_steps.reset()
 
                     score_text = f"Player: {self.player.score}"
                     if vs_ai:
                         score_text += f" | AI: {self.ai_snake.score}"
-                    score_surface = pygame.font.Font(None, 36).render(score_text, True, WHITE)
-                    self.screen.blit(score_surface, (10, 10))
+                    score_surface = renderer.label(score_text, 36, WHITE)
+                    overlays = [(score_surface, score_surface.get_rect(topleft=(10, 10)))]
 
-                    if self.game_over:
+                    if self.engine.game_over:
                         game_over_text = "Game Over! "
-                        if self.winner == "Player":
+                        if self.engine.winner == 0:
                             game_over_text += "You win!"
-                        elif self.winner == "AI":
+                        elif self.engine.winner == 1:
                             game_over_text += "AI wins!"
                         else:
                             game_over_text += "You crashed!"
                         game_over_text += " Press ESC to return to menu"
-                        text_surface = pygame.font.Font(None, 48).render(game_over_text, True, WHITE)
+                        text_surface = renderer.label(game_over_text, 48, WHITE)
                         text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-                        self.screen.blit(text_surface, text_rect)
+                        overlays.append((text_surface, text_rect))
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                    snakes = [self.player, self.ai_snake] if vs_ai else [self.player]
+                    self.board_renderer.draw(self.engine, snakes, overlays)
+
+            if state != "game":
+                pygame.display.flip()
+            elapsed = self.clock.tick(FPS)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snake game")
+    parser.add_argument('--replay', help="replay archive to step through (from run_tournament(record=...))")
+    parser.add_argument('--game', type=int, default=0, help="index of the game in the archive")
+    parser.add_argument('--tick', type=int, default=0, help="tick to start at")
+    args = parser.parse_args()
+
     game = Game()
-    game.run()
\ No newline at end of file
+    if args.replay:
+        game.watch_replay(load_replays(args.replay)[args.game], args.tick)
+    else:
+        game.run()
\ No newline at end of file